@@ -0,0 +1,100 @@
+"""Collision precision benchmark.
+
+Samples bullet/enemy and player/enemy pairs near contact and runs every
+precision level of the tiered hitbox test over the same pairs, reporting
+cost per test and how its hits differ from a plain mask overlap. Then
+plays the same seeded swarm session at each level and reports kills and
+collision-phase time. Pixel masks are the reference and, in practice,
+also the fastest level; the others show what the approximations cost.
+
+    python bench/collisions.py --pairs 20000 --seed 1
+    python bench/collisions.py --frames 1200 --swarm 500
+"""
+import argparse
+import json
+import os
+import random
+import sys
+import time
+
+os.environ.setdefault("PYGAME_HIDE_SUPPORT_PROMPT", "1")
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), os.pardir))
+import pygame
+import main
+
+def sample_pairs(count, seed):
+    """(hitbox, topleft, hitbox, topleft) pairs whose outer circles nearly touch"""
+    rng = random.Random(seed)
+    shooters = [main.ASSETS.get("bullet", (8, 18), main.COLOR_BULLET, angle) for angle in (-20, 0, 20)]
+    shooters.append(main.ASSETS.get("player", (50, 60), main.COLOR_PLAYER))
+    targets = [main.ASSETS.enemy(enemy_type) for enemy_type in main.ENEMY_TYPES]
+
+    pairs = []
+    for _ in range(count):
+        a = rng.choice(shooters)
+        b = rng.choice(targets)
+        ha, hb = a.hitbox, b.hitbox
+        reach = (ha.outer + hb.outer) * 1.1
+        dx, dy = rng.uniform(-reach, reach), rng.uniform(-reach, reach)
+        # Place b's center at (dx, dy) from a's center
+        b_pos = (round(ha.cx + dx - hb.cx), round(ha.cy + dy - hb.cy))
+        pairs.append((ha, (0, 0), hb, b_pos))
+    return pairs
+
+def exact(pairs):
+    return [a.mask.overlap(b.mask, b_pos) is not None for a, _, b, b_pos in pairs]
+
+def run(pairs, precision):
+    start = time.perf_counter()
+    hits = [main.hitboxes_collide(a, a_pos, b, b_pos, precision) for a, a_pos, b, b_pos in pairs]
+    return hits, time.perf_counter() - start
+
+def play(precision, frames, seed, swarm):
+    """One seeded autopilot swarm session with an invulnerable player"""
+    game = main.Game(headless=True, seed=seed, swarm=swarm, collision_precision=precision,
+                     profile_history=True)
+    game.player.invulnerability_timer = float("inf")
+    report = game.run_headless(frames)
+    collisions = game.profiler.summary()["update.collisions"]
+    return {
+        "kills": report["kills"],
+        "score": report["score"],
+        "collisions_ms_mean": collisions["mean"],
+        "collisions_ms_p95": collisions["p95"],
+    }
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Compare collision precision levels")
+    parser.add_argument("--pairs", type=int, default=20000, help="sampled pairs per level")
+    parser.add_argument("--seed", type=int, default=0, help="pair sampling and session seed")
+    parser.add_argument("--frames", type=int, default=600, help="frames per swarm session (0 to skip)")
+    parser.add_argument("--swarm", type=int, default=300, help="enemies kept on the field per session")
+    return parser.parse_args(argv)
+
+def main_cli(argv=None):
+    args = parse_args(argv)
+    pygame.init()
+    pygame.display.set_mode((1, 1))
+    pairs = sample_pairs(args.pairs, args.seed)
+
+    start = time.perf_counter()
+    truth = exact(pairs)
+    baseline = time.perf_counter() - start
+
+    report = {"pairs": len(pairs), "mask_only": {"hits": sum(truth), "us_per_test": baseline / len(pairs) * 1e6}}
+    for precision in main.CollisionPrecision:
+        hits, seconds = run(pairs, precision)
+        report[precision.value] = {
+            "hits": sum(hits),
+            "false_hits": sum(h and not t for h, t in zip(hits, truth)),
+            "missed_hits": sum(t and not h for h, t in zip(hits, truth)),
+            "us_per_test": seconds / len(pairs) * 1e6,
+        }
+        if args.frames:
+            report[precision.value]["session"] = play(precision, args.frames, args.seed, args.swarm)
+    print(json.dumps(report, indent=2))
+    pygame.quit()
+
+if __name__ == "__main__":
+    main_cli()
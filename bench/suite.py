@@ -0,0 +1,234 @@
+"""Reproducible performance benchmarks over scripted stress scenarios.
+
+Every scenario builds a seeded headless Game, scripts a stress load and
+times update and draw separately for a fixed number of frames after a
+warm-up. Each scenario runs --repeat times from scratch and keeps the
+fastest run per phase, which filters out most scheduler noise. Results
+are written as JSON; with --baseline the run is compared against a
+stored result and exits non-zero when any scenario's p50 update, draw
+or frame time regresses beyond --threshold. frame_ms is the end-to-end wall time
+per frame, including any wait on the main thread and the final drain.
+With --pipeline the scenario loop runs on the game's simulation thread
+while the main thread draws, so draw_ms only covers recording and
+handing frames over; compare frame_ms. A baseline recorded with other
+settings (frames, warm-up, repeats, seed, dt, --pipeline) or on another
+machine type is refused before anything runs.
+
+    python bench/suite.py --out bench/baseline.json
+    python bench/suite.py --baseline bench/baseline.json --threshold 0.15
+    python bench/suite.py --only enemies_500 particles_5k
+    python bench/suite.py --pipeline --out bench/pipeline.json
+"""
+import argparse
+import json
+import os
+import platform
+import sys
+import time
+
+import numpy as np
+
+os.environ.setdefault("PYGAME_HIDE_SUPPORT_PROMPT", "1")
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), os.pardir))
+import pygame
+import main
+
+# Every spawn interval pinned at the wave director's floor
+MAX_SPAWN_WAVES = [{"name": "Max", "duration": 3600, "groups": [{"type": "any", "count": 14400, "every": 0.25}]}]
+
+def make_game(seed, **kwargs):
+    game = main.Game(headless=True, seed=seed, **kwargs)
+    # Scenarios measure load, not how long the autopilot survives
+    game.player.invulnerability_timer = float("inf")
+    return game
+
+def enemies_500(seed):
+    game = make_game(seed, swarm=500)
+    return game, None
+
+def particles_5k(seed):
+    game = make_game(seed)
+    game.particles = game.player.particles = main.ParticleSystem(capacity=8192)
+
+    def script(frame):
+        # Keep roughly 5k particles alive
+        missing = 5000 - len(game.particles)
+        if missing > 0:
+            game.particles.emit(main.SCREEN_WIDTH // 2, main.SCREEN_HEIGHT // 2, (255, 0, 255), missing,
+                                life_range=(0.5, 1.5), jitter=(600, 250))
+    return game, script
+
+def spread_rapid_max_spawn(seed):
+    game = make_game(seed)
+    game.director = main.WaveDirector(MAX_SPAWN_WAVES, main.WaveDirector.FALLBACK["loop"])
+    game.reset_game(seed)
+    game.player.invulnerability_timer = float("inf")
+
+    def script(frame):
+        for powerup_type in (main.PowerUpType.SPREAD_SHOT, main.PowerUpType.RAPID_FIRE):
+            game.player.activate_powerup(powerup_type)
+    return game, script
+
+def boss_explosions(seed):
+    game = make_game(seed)
+    rng = np.random.default_rng(seed)
+
+    def script(frame):
+        # A boss dies somewhere on screen every fifth frame
+        if frame % 5 == 0:
+            x = int(rng.integers(100, main.SCREEN_WIDTH - 100))
+            y = int(rng.integers(100, main.SCREEN_HEIGHT - 200))
+            game.on_enemy_killed_with_data("boss", x, y)
+    return game, script
+
+SCENARIOS = {
+    "enemies_500": enemies_500,
+    "particles_5k": particles_5k,
+    "spread_rapid_max_spawn": spread_rapid_max_spawn,
+    "boss_explosions": boss_explosions,
+}
+
+def stats(samples):
+    values = np.array(samples) * 1000
+    p50, p95, p99 = np.percentile(values, (50, 95, 99))
+    return {"mean": float(values.mean()), "p50": float(p50), "p95": float(p95), "p99": float(p99)}
+
+def run_scenario(name, frames, warmup, seed, dt, repeat=1, pipeline=False):
+    """Best-of-repeat timings for one scenario, by p50 per phase"""
+    runs = [run_once(name, frames, warmup, seed, dt, pipeline) for _ in range(repeat)]
+    result = dict(runs[0])
+    for phase in ("update_ms", "draw_ms", "frame_ms"):
+        result[phase] = min((run[phase] for run in runs), key=lambda s: s["p50"])
+    return result
+
+def run_once(name, frames, warmup, seed, dt, pipeline=False):
+    game, script = SCENARIOS[name](seed)
+    game.pipeline = pipeline
+    update_times = []
+    draw_times = []
+    # Start of every timed frame, closed off by the time the last one is on screen
+    marks = []
+
+    def play():
+        for frame in range(warmup + frames):
+            if script is not None:
+                script(frame)
+            start = time.perf_counter()
+            if frame >= warmup:
+                marks.append(start)
+            game.tick(dt)
+            mid = time.perf_counter()
+            game.draw()
+            end = time.perf_counter()
+            game.end_frame()
+            if frame >= warmup:
+                update_times.append(mid - start)
+                draw_times.append(end - mid)
+
+    if pipeline:
+        game.run_pipelined(play)
+    else:
+        play()
+    marks.append(time.perf_counter())
+    return {
+        "update_ms": stats(update_times),
+        "draw_ms": stats(draw_times),
+        "frame_ms": stats(np.diff(marks)),
+        "enemies": len(game.enemies),
+        "particles": len(game.particles),
+        "bullets": len(game.bullets),
+    }
+
+# Settings a baseline must share with the current run to be comparable
+COMPARABLE_META = ("frames", "warmup", "repeat", "seed", "dt", "pipeline", "machine")
+
+def meta_mismatches(meta, baseline_meta):
+    """(key, baseline, current) for every comparable setting that differs"""
+    # Baselines from before --pipeline existed were all unpipelined
+    baseline_meta = {"pipeline": False, **baseline_meta}
+    return [(key, baseline_meta.get(key), meta[key]) for key in COMPARABLE_META
+            if baseline_meta.get(key) != meta[key]]
+
+def compare(results, baseline, threshold, metric="p50"):
+    """Print a comparison table and return the regressions beyond threshold"""
+    regressions = []
+    print(f"{'scenario':28} {'phase':7} {'baseline':>9} {'current':>9} {'change':>8}", file=sys.stderr)
+    for name, result in results["scenarios"].items():
+        base = baseline["scenarios"].get(name)
+        if base is None:
+            print(f"{name:28} (not in baseline)", file=sys.stderr)
+            continue
+        for phase in ("update_ms", "draw_ms", "frame_ms"):
+            if phase not in base:
+                continue
+            old = base[phase][metric]
+            new = result[phase][metric]
+            change = (new - old) / old if old > 0 else 0.0
+            flag = "  REGRESSION" if change > threshold else ""
+            print(f"{name:28} {phase[:-3]:7} {old:9.3f} {new:9.3f} {change:+8.1%}{flag}", file=sys.stderr)
+            if flag:
+                regressions.append((name, phase, change))
+    return regressions
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Run the Neon Assault benchmark scenarios")
+    parser.add_argument("--frames", type=int, default=600, help="timed frames per scenario")
+    parser.add_argument("--warmup", type=int, default=120, help="untimed frames before timing")
+    parser.add_argument("--seed", type=int, default=1234, help="seed for every scenario")
+    parser.add_argument("--repeat", type=int, default=3, help="runs per scenario; the fastest counts")
+    parser.add_argument("--dt", type=float, default=main.SIM_DT, help="fixed timestep in seconds")
+    parser.add_argument("--pipeline", action="store_true", help="draw on the game's render thread")
+    parser.add_argument("--only", nargs="+", choices=list(SCENARIOS), help="run just these scenarios")
+    parser.add_argument("--out", help="write results JSON here (default: stdout)")
+    parser.add_argument("--baseline", help="compare against this results JSON")
+    parser.add_argument("--threshold", type=float, default=0.15,
+                        help="fail when p50 update, draw or frame time grows by more than this fraction")
+    return parser.parse_args(argv)
+
+def main_cli(argv=None):
+    args = parse_args(argv)
+    results = {
+        "meta": {
+            "frames": args.frames,
+            "warmup": args.warmup,
+            "repeat": args.repeat,
+            "seed": args.seed,
+            "dt": args.dt,
+            "pipeline": args.pipeline,
+            "python": platform.python_version(),
+            "pygame": pygame.version.ver,
+            "numpy": np.__version__,
+            "machine": platform.machine(),
+        },
+        "scenarios": {},
+    }
+    if args.baseline:
+        with open(args.baseline) as f:
+            baseline = json.load(f)
+        mismatches = meta_mismatches(results["meta"], baseline["meta"])
+        if mismatches:
+            for key, old, new in mismatches:
+                print(f"{key}: baseline {old!r}, current {new!r}", file=sys.stderr)
+            sys.exit(f"{args.baseline} was recorded with different settings; timings are not comparable")
+
+    for name in args.only or SCENARIOS:
+        start = time.perf_counter()
+        results["scenarios"][name] = run_scenario(name, args.frames, args.warmup, args.seed, args.dt, args.repeat,
+                                                    args.pipeline)
+        print(f"{name}: {time.perf_counter() - start:.1f} s", file=sys.stderr)
+    pygame.quit()
+
+    if args.out:
+        with open(args.out, "w") as f:
+            json.dump(results, f, indent=2)
+    else:
+        print(json.dumps(results, indent=2))
+
+    if args.baseline:
+        regressions = compare(results, baseline, args.threshold)
+        if regressions:
+            sys.exit(f"{len(regressions)} regression(s) beyond {args.threshold:.0%}")
+
+if __name__ == "__main__":
+    main_cli()
@@ -1,7 +1,24 @@
 import pygame
+import numpy as np
+import argparse
+import contextlib
+import csv
+import gc
+import hashlib
+import heapq
+import json
+import mmap
 import random
 import sys
 import math
+import os
+import struct
+import threading
+import time
+import tracemalloc
+from array import array
+from collections import OrderedDict, deque
+from contextlib import contextmanager
 from dataclasses import dataclass
 from typing import List, Tuple
 from enum import Enum
@@ -11,9 +28,28 @@ SCREEN_WIDTH = 1500
 SCREEN_HEIGHT = 700
 FPS = 60
 
+# The windowed loop simulates in fixed steps and draws interpolated
+# between the last two; a stalled frame runs at most MAX_CATCH_UP_STEPS
+# steps and the rest of the backlog is dropped
+SIM_RATE = 120
+SIM_DT = 1.0 / SIM_RATE
+MAX_CATCH_UP_STEPS = 8
+# Largest per-step move that is drawn interpolated; bigger jumps are
+# wraps or reused slots and are drawn where they landed
+INTERP_SNAP = 64
+
+# Screen areas the HUD may touch, repainted every frame by the dirty-rect renderer
+HUD_REGIONS = (
+    pygame.Rect(0, 0, 340, 115),                                  # score, high score, kills
+    pygame.Rect(SCREEN_WIDTH // 2 - 320, 100, 640, 90),           # combo
+    pygame.Rect(SCREEN_WIDTH // 2 - 320, 200, 640, 100),          # wave banner
+    pygame.Rect(0, SCREEN_HEIGHT - 50, 130, 50),                  # hearts
+    pygame.Rect(SCREEN_WIDTH - 190, SCREEN_HEIGHT - 140, 190, 140),  # power-up timers
+)
+
 # Layers (Z-Index)
 LAYER_BG = 0
-LAYER_STAR = 1
+LAYER_STAR = 1  # Drawn by Starfield beneath every sprite layer
 LAYER_PARTICLE = 2
 LAYER_POWERUP = 3
 LAYER_ENEMY = 4
@@ -40,6 +76,18 @@ BULLET_SPEED = 900
 ENEMY_MIN_SPEED = 120
 ENEMY_MAX_SPEED = 320
 
+# Balance knobs (overridable by the batch simulator); the weights pick
+# the type of "any" spawns in wave definitions
+ENEMY_SPAWN_WEIGHTS = {"normal": 0.65, "fast": 0.20, "tank": 0.12, "boss": 0.03}
+COMBO_MULTIPLIER_STEP = 0.5
+
+# Wave definitions, played by WaveDirector
+WAVES_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "waves.json")
+WAVE_ANNOUNCE_TIME = 2.0
+
+# Prebaked art, written by --build-assets and memory-mapped at startup
+ASSET_PACK_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "assets.pack")
+
 class PowerUpType(Enum):
     SHIELD = 1
     RAPID_FIRE = 2
@@ -57,430 +105,1608 @@ POWERUP_CONFIGS = {
     PowerUpType.SPREAD_SHOT: PowerUpConfig((0, 255, 150), 7.0, "⊕"),
 }
 
-class Star(pygame.sprite.Sprite):
-    def __init__(self, groups, layer):
-        super().__init__(groups)
-        self._layer = layer
-        self.size = random.randint(1, 4)
-        
-        # Enhanced star rendering with glow effect
-        glow_size = self.size + 2
-        self.image = pygame.Surface((glow_size, glow_size), pygame.SRCALPHA)
-        
-        shade = random.randint(80, 200)
-        color = (shade, shade, shade + 50)
-        
-        # Draw glow
-        for i in range(glow_size, 0, -1):
-            alpha = int(255 * (1 - i / glow_size) * 0.3)
-            glow_color = (*color, alpha)
-            pygame.draw.circle(self.image, glow_color, (glow_size//2, glow_size//2), i//2)
-        
-        # Draw core
-        pygame.draw.circle(self.image, color, (glow_size//2, glow_size//2), max(1, self.size//2))
-        
-        self.rect = self.image.get_rect(
-            center=(random.randint(0, SCREEN_WIDTH), random.randint(0, SCREEN_HEIGHT))
-        )
-        self.speed = self.size * 25
-        self.twinkle_timer = random.uniform(0, 2)
-        self.twinkle_speed = random.uniform(0.5, 2)
+@dataclass
+class QualityTier:
+    name: str
+    particles: float   # share of each particle burst that is emitted
+    trails: float      # scale on the enemy trail chance
+    bullet_trail: int  # streak segments drawn behind each bullet
+    glow: float        # scale on the largest glow stamp size of a burst
+
+# Visual quality from best to cheapest, stepped through by QualityGovernor
+QUALITY_TIERS = (
+    QualityTier("high", 1.0, 1.0, 3, 1.0),
+    QualityTier("medium", 0.6, 0.5, 2, 0.75),
+    QualityTier("low", 0.35, 0.25, 1, 0.6),
+    QualityTier("minimal", 0.15, 0.0, 0, 0.5),
+)
+
+class RandomStreams:
+    """Independent seeded random streams, one per subsystem.
+
+    Gameplay streams (spawns, enemies) never share state with cosmetic
+    ones (stars, effects, shake, particles), so drawing more or fewer
+    frames cannot change the outcome of a seeded session. Streams that
+    are sampled in vectorized batches are NumPy generators.
+    """
+    GAMEPLAY = ("spawns", "enemies")
+    COSMETIC = ("stars", "effects", "shake", "particles")
+    VECTORIZED = ("stars", "effects", "particles")
+
+    def __init__(self, seed=None):
+        self.reseed(seed)
+
+    def reseed(self, seed=None):
+        if seed is None:
+            seed = random.SystemRandom().randrange(2**63)
+        self.seed = seed
+        names = self.GAMEPLAY + self.COSMETIC
+        for name, child in zip(names, np.random.SeedSequence(seed).spawn(len(names))):
+            if name in self.VECTORIZED:
+                stream = np.random.default_rng(child)
+            else:
+                stream = random.Random(int(child.generate_state(1, np.uint64)[0]))
+            setattr(self, name, stream)
+
+RNG = RandomStreams()
+
+def interpolate(prev, current, alpha):
+    """Positions alpha of the way from prev to current, rows that moved
+    further than INTERP_SNAP in one step drawn at current"""
+    if alpha >= 1.0:
+        return current
+    jumped = np.abs(current - prev) > INTERP_SNAP
+    if jumped.ndim == 2:
+        jumped = jumped.any(axis=1, keepdims=True)
+    return np.where(jumped, current, prev + (current - prev) * alpha)
+
+# Power-up animation strip: pulse phases x rotation steps, baked once per type
+POWERUP_SIZE = 30
+POWERUP_PULSE_FRAMES = 8
+POWERUP_ROTATION_FRAMES = 24
+
+# Shield ring drawn around the player
+SHIELD_SIZE = (70, 70)
+
+# Enemy art: type -> (size, base color)
+ENEMY_ART = {
+    "normal": (30, COLOR_ENEMY),
+    "fast": (25, (255, 50, 255)),
+    "tank": (35, (200, 0, 200)),
+    "boss": (80, (200, 0, 150)),
+}
+
+def draw_star(size, color):
+    # Enhanced star rendering with glow effect
+    glow_size = size + 2
+    image = pygame.Surface((glow_size, glow_size), pygame.SRCALPHA)
+
+    # Draw glow
+    for i in range(glow_size, 0, -1):
+        alpha = int(255 * (1 - i / glow_size) * 0.3)
+        pygame.draw.circle(image, (*color, alpha), (glow_size//2, glow_size//2), i//2)
+
+    # Draw core
+    pygame.draw.circle(image, color, (glow_size//2, glow_size//2), max(1, size//2))
+    return image
+
+def draw_glow(size, color):
+    image = pygame.Surface((size, size), pygame.SRCALPHA)
+    for i in range(size, 0, -1):
+        alpha = int(255 * (1 - i / size))
+        pygame.draw.circle(image, (*color, alpha), (size//2, size//2), i//2)
+    return image
+
+def draw_dot(size, color):
+    image = pygame.Surface((size, size), pygame.SRCALPHA)
+    pygame.draw.circle(image, color, (size//2, size//2), size//2)
+    return image
+
+def draw_heart(size, color):
+    # Heart is drawn at 30px and scaled for the HUD pulse sizes
+    image = pygame.Surface((30, 30), pygame.SRCALPHA)
+    pygame.draw.circle(image, color, (9, 9), 9)
+    pygame.draw.circle(image, color, (21, 9), 9)
+    pygame.draw.polygon(image, color, [(0, 14), (30, 14), (15, 30)])
+    if size != 30:
+        image = pygame.transform.scale(image, (size, size))
+    return image
+
+def draw_shield(size, color):
+    w, h = size
+    image = pygame.Surface(size, pygame.SRCALPHA)
+    pygame.draw.circle(image, color, (w // 2, h // 2), w // 2, 3)
+    return image
+
+def draw_bullet(size, color):
+    w, h = size
+    image = pygame.Surface(size, pygame.SRCALPHA)
+    # Outer glow
+    pygame.draw.ellipse(image, (*color, 100), (0, 0, w, h))
+    # Core
+    pygame.draw.ellipse(image, color, (1, 1, w - 2, h - 2))
+    # Highlight
+    pygame.draw.ellipse(image, (255, 150, 150), (2, 2, w - 4, h // 2 - 1))
+    return image
+
+def draw_player(size, color):
+    w, h = size
+    image = pygame.Surface(size, pygame.SRCALPHA)
+
+    # Outer glow
+    for i in range(5):
+        alpha = int(80 * (1 - i/5))
+        glow_offset = i * 2
+        points = [(w//2, 0-glow_offset), (w+glow_offset, h), (w//2, h-10), (0-glow_offset, h)]
+        pygame.draw.polygon(image, (*color, alpha), points)
+
+    # Main body
+    pygame.draw.polygon(image, color, [(w//2, 0), (w, h), (w//2, h-10), (0, h)])
+    # Highlight
+    pygame.draw.polygon(image, (200, 255, 255), [(w//2, 10), (w//2+10, h-10), (w//2, h-18), (w//2-10, h-10)])
+    # Cockpit
+    pygame.draw.circle(image, (100, 255, 255), (w//2, 25), 5)
+    return image
+
+def draw_enemy_boss(size, color):
+    # Boss design - menacing large enemy
+    image = pygame.Surface((size, size), pygame.SRCALPHA)
+
+    # Outer spiky shell
+    points = []
+    for i in range(8):
+        angle = i * 45
+        rad = size // 2 if i % 2 == 0 else size // 3
+        x = size//2 + rad * math.cos(math.radians(angle))
+        y = size//2 + rad * math.sin(math.radians(angle))
+        points.append((x, y))
+    pygame.draw.polygon(image, color, points)
+
+    # Inner core
+    pygame.draw.circle(image, (255, 50, 255), (size//2, size//2), size//4)
+
+    # Glowing center
+    for i in range(3, 0, -1):
+        alpha = int(200 * (1 - i/3))
+        pygame.draw.circle(image, (*color, alpha), (size//2, size//2), i * 8)
+
+    # Add some detail lines
+    pygame.draw.circle(image, (255, 200, 255), (size//2, size//2), size//5, 2)
+    return image
+
+def draw_enemy_tank(size, color):
+    # Large, tough enemy
+    image = pygame.Surface((size, size), pygame.SRCALPHA)
+    pygame.draw.polygon(image, color, 
+                      [(size//2, 0), (size, size//2), (size//2, size), (0, size//2)])
+    pygame.draw.polygon(image, (255, 100, 255), 
+                      [(size//2, 5), (size-5, size//2), (size//2, size-5), (5, size//2)])
+    return image
+
+def draw_enemy_fast(size, color):
+    # Small, fast enemy
+    image = pygame.Surface((size, size), pygame.SRCALPHA)
+    points = []
+    for i in range(6):
+        angle = i * 60
+        rad = size // 2 if i % 2 == 0 else size // 4
+        x = size//2 + rad * math.cos(math.radians(angle))
+        y = size//2 + rad * math.sin(math.radians(angle))
+        points.append((x, y))
+    pygame.draw.polygon(image, color, points)
+    pygame.draw.polygon(image, (255, 150, 255), 
+                      [(p[0] * 0.7 + size//2 * 0.3, p[1] * 0.7 + size//2 * 0.3) for p in points])
+    return image
+
+def draw_enemy_normal(size, color):
+    image = pygame.Surface((size, size), pygame.SRCALPHA)
+    pygame.draw.polygon(image, color, 
+                      [(size//2, 0), (size, size//2), (size//2, size), (0, size//2)])
+    pygame.draw.polygon(image, (255, 200, 255), 
+                      [(size//2, 5), (size-5, size//2), (size//2, size-5), (5, size//2)])
+    return image
+
+def draw_powerup(size, color, scale, symbol):
+    image = pygame.Surface((size, size), pygame.SRCALPHA)
+
+    # Outer glow
+    for i in range(5, 0, -1):
+        alpha = int(100 * (1 - i/5) * scale)
+        pygame.draw.circle(image, (*color, alpha), (size//2, size//2), size//2 - i)
+
+    # Core shape
+    inner_size = int((size - 10) * scale)
+    pygame.draw.circle(image, color, (size//2, size//2), inner_size//2)
+
+    # Symbol
+    image.blit(symbol, symbol.get_rect(center=(size//2, size//2)))
+    return image
+
+class CollisionPrecision(Enum):
+    """Narrow-phase test used after the broadphase and rect check.
+
+    PIXEL, a single mask overlap, is exact and also the cheapest in Python.
+    CIRCLE and POLYGON are kept for comparison in bench/collisions.py: both
+    cost more per test (circle about 2-3x, polygon about 40x) and disagree
+    with the masks, circle missing about a quarter of true hits and polygon
+    accepting hull-only overlaps.
+    """
+    CIRCLE = "circle"
+    POLYGON = "polygon"
+    PIXEL = "pixel"
+
+class Hitbox:
+    """Collision geometry derived once from a mask.
+
+    outer and inner are the radii of circles around the surface center
+    that contain every solid pixel and contain only solid pixels; radius
+    is the equal-area circle. hull is the convex hull of the solid pixels
+    (pixel corners) in surface coordinates, trimmed of near-collinear vertices.
+    """
+    __slots__ = ("mask", "cx", "cy", "outer", "inner", "radius", "hull")
+
+    def __init__(self, mask):
+        self.mask = mask
+        w, h = mask.get_size()
+        self.cx, self.cy = w / 2, h / 2
+
+        solid = np.zeros((w + 2, h + 2), dtype=bool)
+        solid[1:-1, 1:-1] = pygame.surfarray.array_red(mask.to_surface()) > 0
+        half_diag = math.sqrt(0.5)
+        xs, ys = np.nonzero(solid)
+        if len(xs) == 0:
+            self.outer = self.inner = self.radius = 0.0
+            self.hull = []
+            return
+        self.outer = float(np.hypot(xs - 0.5 - self.cx, ys - 0.5 - self.cy).max()) + half_diag
+        xs_out, ys_out = np.nonzero(~solid)
+        self.inner = max(0.0, float(np.hypot(xs_out - 0.5 - self.cx, ys_out - 0.5 - self.cy).min()) - half_diag)
+        self.radius = math.sqrt(len(xs) / math.pi)
+        self.hull = convex_hull([(x + dx, y + dy) for x, y in mask.outline() for dx in (0, 1) for dy in (0, 1)])
+
+    @property
+    def geometry(self):
+        return [self.cx, self.cy, self.outer, self.inner, self.radius, self.hull]
+
+    @classmethod
+    def from_geometry(cls, mask, cx, cy, outer, inner, radius, hull):
+        """Rebuild a hitbox from stored geometry without rescanning the mask"""
+        hitbox = cls.__new__(cls)
+        hitbox.mask = mask
+        hitbox.cx, hitbox.cy = cx, cy
+        hitbox.outer, hitbox.inner, hitbox.radius = outer, inner, radius
+        hitbox.hull = [tuple(point) for point in hull]
+        return hitbox
+
+def convex_hull(points, tolerance=0.75):
+    """Monotone-chain convex hull as a vertex list, dropping vertices
+    within tolerance of the line through their neighbours"""
+    points = sorted(set(points))
+    if len(points) < 3:
+        return points
+
+    def half(points):
+        chain = []
+        for p in points:
+            while len(chain) >= 2 and ((chain[-1][0] - chain[-2][0]) * (p[1] - chain[-2][1]) -
+                                       (chain[-1][1] - chain[-2][1]) * (p[0] - chain[-2][0])) <= 0:
+                chain.pop()
+            chain.append(p)
+        return chain[:-1]
+
+    hull = half(points) + half(points[::-1])
+    trimmed = True
+    while trimmed and len(hull) > 3:
+        trimmed = False
+        for k in range(len(hull)):
+            (ax, ay), (bx, by), (cx, cy) = hull[k - 1], hull[k], hull[(k + 1) % len(hull)]
+            if abs((cx - ax) * (by - ay) - (cy - ay) * (bx - ax)) <= tolerance * math.hypot(cx - ax, cy - ay):
+                del hull[k]
+                trimmed = True
+                break
+    return hull
+
+def convex_overlap(a, b, offset=(0, 0)):
+    """Separating-axis test for two convex vertex lists, b shifted by offset"""
+    ox, oy = offset
+    b = [(x + ox, y + oy) for x, y in b]
+    for poly in (a, b):
+        for k in range(len(poly)):
+            (x0, y0), (x1, y1) = poly[k - 1], poly[k]
+            nx, ny = y0 - y1, x1 - x0
+            pa = [nx * x + ny * y for x, y in a]
+            pb = [nx * x + ny * y for x, y in b]
+            if max(pa) <= min(pb) or max(pb) <= min(pa):
+                return False
+    return True
+
+def hitboxes_collide(a, a_pos, b, b_pos, precision=CollisionPrecision.PIXEL):
+    """Tiered overlap test for hitboxes whose surfaces sit at topleft a_pos and b_pos.
+
+    Pixel masks are tested straight away: one mask overlap costs less than
+    the circle tests in Python. For the other levels, pairs beyond the
+    outer circles are rejected and pairs within the inner circles accepted
+    outright; only near-boundary pairs reach the precision test
+    (equal-area circles or convex hulls).
+    """
+    ox = b_pos[0] - a_pos[0]
+    oy = b_pos[1] - a_pos[1]
+    if precision is CollisionPrecision.PIXEL:
+        return a.mask.overlap(b.mask, (ox, oy)) is not None
+    dx = ox + b.cx - a.cx
+    dy = oy + b.cy - a.cy
+    d2 = dx * dx + dy * dy
+    reach = a.outer + b.outer
+    if d2 > reach * reach:
+        return False
+    core = a.inner + b.inner
+    if d2 <= core * core:
+        return True
+    if precision is CollisionPrecision.CIRCLE:
+        reach = a.radius + b.radius
+        return d2 <= reach * reach
+    return convex_overlap(a.hull, b.hull, (ox, oy))
+
+def load_font(name, size):
+    """Open a font, starting pygame's font module on first use"""
+    if not pygame.font.get_init():
+        pygame.font.init()
+    return pygame.font.Font(name, size)
+
+def code_digest(code):
+    """Bytes identifying what a code object does, ignoring where it sits in the file"""
+    parts = [code.co_code, repr(code.co_names).encode()]
+    for const in code.co_consts:
+        parts.append(code_digest(const) if hasattr(const, "co_code") else repr(const).encode())
+    return b"|".join(parts)
+
+class Asset:
+    """A shared surface with its collision mask and hitbox built on first use"""
+    __slots__ = ("image", "_mask", "_hitbox")
+
+    def __init__(self, image):
+        self.image = image
+        self._mask = None
+        self._hitbox = None
+
+    @property
+    def mask(self):
+        if self._mask is None:
+            self._mask = pygame.mask.from_surface(self.image)
+        return self._mask
+
+    @property
+    def hitbox(self):
+        if self._hitbox is None:
+            self._hitbox = Hitbox(self.mask)
+        return self._hitbox
+
+class AssetCache:
+    """Procedural art drawn once and shared by every entity.
+
+    Entries are keyed by (kind, size, color, angle, alpha, flash), where
+    flash is a white additive tint applied on top of the base art. Surfaces are
+    converted to the display format when a display exists, and callers get
+    shared references, so they must never draw into them.
+
+    save_pack writes every entry's pixels and hitbox geometry to one file,
+    which load_pack memory-maps and wraps without drawing anything. The pack
+    carries a fingerprint of the drawing code and art settings and is
+    ignored once either changes.
+    """
+    PACK_MAGIC = b"NEONPAK1"
+    BUILDERS = {
+        "star": draw_star,
+        "glow": draw_glow,
+        "dot": draw_dot,
+        "heart": draw_heart,
+        "bullet": draw_bullet,
+        "shield": draw_shield,
+        "player": draw_player,
+        "enemy_normal": draw_enemy_normal,
+        "enemy_fast": draw_enemy_fast,
+        "enemy_tank": draw_enemy_tank,
+        "enemy_boss": draw_enemy_boss,
+    }
+
+    def __init__(self):
+        self.entries = {}
+        # Memory map behind surfaces loaded from a pack, kept open while they
+        # live, and the index of packed entries not yet wrapped
+        self.pack = None
+        self.pack_pixels = None
+        self.packed = {}
+        self.packed_strips = {}
+
+    def __len__(self):
+        return len(self.entries)
+
+    def get(self, kind, size, color=None, angle=0, alpha=255, flash=0):
+        key = (kind, size, color, angle, alpha, flash)
+        asset = self.entries.get(key)
+        if asset is None:
+            entry = self.packed.pop(repr(key), None)
+            if entry is not None:
+                asset = self.unpack(entry)
+            else:
+                asset = Asset(self.build(kind, size, color, angle, alpha, flash))
+            self.entries[key] = asset
+        return asset
+
+    def build(self, kind, size, color, angle, alpha, flash):
+        if angle != 0 or alpha != 255 or flash != 0:
+            # Variants derive from the shared upright, opaque base
+            image = self.get(kind, size, color).image
+            if angle != 0:
+                image = pygame.transform.rotate(image, -angle)
+            else:
+                image = image.copy()
+            if flash != 0:
+                image.fill((flash, flash, flash, 0), special_flags=pygame.BLEND_RGB_ADD)
+            if alpha != 255:
+                image.set_alpha(alpha)
+            return image
+
+        image = self.BUILDERS[kind](size, color)
+        if pygame.display.get_surface() is not None:
+            image = image.convert_alpha()
+        return image
+
+    def enemy(self, enemy_type, flash=0):
+        size, color = ENEMY_ART[enemy_type]
+        return self.get(f"enemy_{enemy_type}", size, color, flash=flash)
+
+    def powerup_strip(self, powerup_type):
+        """Looping animation frames for a power-up, indexed [pulse][rotation]"""
+        key = ("powerup", powerup_type)
+        strip = self.entries.get(key)
+        if strip is None:
+            entries = self.packed_strips.pop(powerup_type.name, None)
+            if entries is not None:
+                strip = [[self.unpack(entry) for entry in frames] for frames in entries]
+            else:
+                strip = self.build_powerup_strip(powerup_type)
+            self.entries[key] = strip
+        return strip
+
+    def build_powerup_strip(self, powerup_type):
+        config = POWERUP_CONFIGS[powerup_type]
+        font = load_font(None, 24)
+        symbol = font.render(config.symbol, True, (255, 255, 255))
+        convert = pygame.display.get_surface() is not None
+
+        strip = []
+        for p in range(POWERUP_PULSE_FRAMES):
+            scale = 0.9 + 0.1 * math.sin(math.tau * p / POWERUP_PULSE_FRAMES)
+            base = draw_powerup(POWERUP_SIZE, config.color, scale, symbol)
+            frames = []
+            for r in range(POWERUP_ROTATION_FRAMES):
+                image = pygame.transform.rotate(base, 360 * r / POWERUP_ROTATION_FRAMES)
+                if convert:
+                    image = image.convert_alpha()
+                frames.append(Asset(image))
+            strip.append(frames)
+        return strip
+
+    def fingerprint(self):
+        """Hash of everything that shapes the art, so a stale pack is never used"""
+        digest = hashlib.sha256(pygame.version.ver.encode())
+        for function in (*self.BUILDERS.values(), draw_powerup, AssetCache.build,
+                         AssetCache.build_powerup_strip, Hitbox.__init__, convex_hull):
+            digest.update(code_digest(function.__code__))
+        digest.update(repr((ENEMY_ART, POWERUP_CONFIGS, POWERUP_SIZE, POWERUP_PULSE_FRAMES,
+                            POWERUP_ROTATION_FRAMES)).encode())
+        return digest.hexdigest()
+
+    def save_pack(self, path):
+        """Write every cached asset to path; returns the number of surfaces stored"""
+        pixels = bytearray()
+
+        def record(asset):
+            image = asset.image
+            alpha = image.get_alpha()
+            hitbox = asset._hitbox.geometry if asset._hitbox is not None else None
+            entry = [*image.get_size(), len(pixels), alpha if alpha != 255 else None, hitbox]
+            pixels.extend(pygame.image.tobytes(image, "BGRA"))
+            return entry
+
+        assets = {}
+        strips = {}
+        for key, entry in self.entries.items():
+            if key[0] == "powerup":
+                strips[key[1].name] = [[record(asset) for asset in frames] for frames in entry]
+            else:
+                assets[repr(key)] = record(entry)
+
+        index = json.dumps({"hash": self.fingerprint(), "assets": assets, "strips": strips}).encode()
+        # Pad so the pixel data starts 16-byte aligned
+        index += b" " * (-(len(self.PACK_MAGIC) + 4 + len(index)) % 16)
+        # Write beside the target and swap it in, so a crash never leaves a
+        # truncated pack and a game that has the old one mapped keeps its pages
+        temp = f"{path}.tmp"
+        with open(temp, "wb") as f:
+            f.write(self.PACK_MAGIC)
+            f.write(struct.pack("<I", len(index)))
+            f.write(index)
+            f.write(pixels)
+        os.replace(temp, path)
+        return len(assets) + sum(len(frames) for strip in strips.values() for frames in strip)
+
+    def load_pack(self, path):
+        """Map a pack written by save_pack; returns the number of surfaces it
+        holds, 0 when it is missing or stale.
+
+        Only the index is read here. get and powerup_strip wrap an entry's
+        pixels the first time it is asked for, before falling back to drawing.
+        """
+        try:
+            with open(path, "rb") as f:
+                pack = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        except (OSError, ValueError):
+            return 0
+        header = len(self.PACK_MAGIC) + 4
+        if pack[:len(self.PACK_MAGIC)] != self.PACK_MAGIC:
+            print(f"Ignoring {path}: not an asset pack")
+            pack.close()
+            return 0
+        try:
+            (length,) = struct.unpack_from("<I", pack, len(self.PACK_MAGIC))
+            index = json.loads(pack[header:header + length])
+            if index["hash"] != self.fingerprint():
+                print(f"Ignoring stale {path}: the art changed, rebuild it with --build-assets")
+                pack.close()
+                return 0
+            assets = index["assets"]
+            strips = index["strips"]
+            entries = [*assets.values(), *(entry for strip in strips.values() for frames in strip for entry in frames)]
+            end = max((offset + w * h * 4 for w, h, offset, _alpha, _hitbox in entries), default=0)
+            if any(w <= 0 or h <= 0 or offset < 0 for w, h, offset, _alpha, _hitbox in entries):
+                raise ValueError("negative size or offset in the index")
+        except (struct.error, ValueError, KeyError, TypeError, AttributeError) as e:
+            print(f"Ignoring corrupt {path}: {type(e).__name__}: {e}")
+            pack.close()
+            return 0
+        if header + length + end > len(pack):
+            print(f"Ignoring truncated {path}: rebuild it with --build-assets")
+            pack.close()
+            return 0
+
+        self.pack = pack
+        self.pack_pixels = memoryview(pack)[header + length:]
+        self.packed = assets
+        self.packed_strips = strips
+        return len(entries)
+
+    def unpack(self, entry):
+        """Wrap a packed entry's pixels as an Asset without copying them"""
+        w, h, offset, alpha, hitbox = entry
+        image = pygame.image.frombuffer(self.pack_pixels[offset:offset + w * h * 4], (w, h), "BGRA")
+        if alpha is not None:
+            image.set_alpha(alpha)
+        asset = Asset(image)
+        if hitbox is not None:
+            asset._hitbox = Hitbox.from_geometry(asset.mask, *hitbox)
+        return asset
+
+    def prewarm(self):
+        """Build the art every session needs so spawning never draws"""
+        for angle in (-20, 0, 20):
+            self.get("bullet", (8, 18), COLOR_BULLET, angle).hitbox
+        for enemy_type in ENEMY_ART:
+            self.enemy(enemy_type).hitbox
+        self.get("player", (50, 60), COLOR_PLAYER).hitbox
+        for level in range(ShieldSprite.ALPHA_LEVELS):
+            self.get("shield", SHIELD_SIZE, COLOR_POWERUP_SHIELD, alpha=ShieldSprite.level_alpha(level))
+        for powerup_type in PowerUpType:
+            self.powerup_strip(powerup_type)
+
+ASSETS = AssetCache()
+
+class Starfield:
+    """Parallax background stars stored in NumPy arrays.
+
+    Positions, speeds and twinkle phases advance in one vectorized step,
+    and each star is drawn with a prebaked stamp picked by
+    (size, shade, brightness level), so density can scale to thousands of
+    stars without a Python object per star.
+    """
+    SIZES = (1, 2, 3, 4)
+    SHADES = tuple(range(80, 201, 20))
+    TWINKLE_LEVELS = 16
+
+    def __init__(self, count=80):
+        self.count = count
+        rng = RNG.stars
+        self.size_idx = rng.integers(0, len(self.SIZES), count)
+        self.shade_idx = rng.integers(0, len(self.SHADES), count)
+        sizes = np.array(self.SIZES)[self.size_idx]
+
+        # Stamps are size + 2 pixels wide to fit the glow
+        self.half_size = (sizes + 2) // 2
+        self.pos = np.column_stack((rng.integers(0, SCREEN_WIDTH + 1, count),
+                                    rng.integers(0, SCREEN_HEIGHT + 1, count))).astype(np.float32)
+        self.prev_pos = self.pos.copy()
+        self.speed = (sizes * 25).astype(np.float32)
+        self.twinkle_timer = rng.uniform(0, 2, count).astype(np.float32)
+        self.twinkle_speed = rng.uniform(0.5, 2, count).astype(np.float32)
+
+        # Flat stamp table indexed by (size, shade, level)
+        top = self.TWINKLE_LEVELS - 1
+        alphas = [150 + 105 * (2 * level - top) // top for level in range(self.TWINKLE_LEVELS)]
+        self.stamps = [ASSETS.get("star", size, (shade, shade, shade + 50), alpha=alpha).image
+                       for size in self.SIZES for shade in self.SHADES for alpha in alphas]
+        self.stamp_base = (self.size_idx * len(self.SHADES) + self.shade_idx) * self.TWINKLE_LEVELS
+
+    def __len__(self):
+        return self.count
 
     def update(self, dt):
-        self.rect.y += self.speed * dt
-        if self.rect.top > SCREEN_HEIGHT:
-            self.rect.bottom = 0
-            self.rect.x = random.randint(0, SCREEN_WIDTH)
-        
+        self.prev_pos[:] = self.pos
+        self.pos[:, 1] += self.speed * dt
+
+        # Stars that scroll off the bottom re-enter at the top at a new x
+        wrapped = self.pos[:, 1] - self.half_size > SCREEN_HEIGHT
+        if wrapped.any():
+            n = int(wrapped.sum())
+            self.pos[wrapped, 1] = -self.half_size[wrapped]
+            self.pos[wrapped, 0] = RNG.stars.integers(0, SCREEN_WIDTH + 1, n)
+
         # Twinkle effect
         self.twinkle_timer += dt * self.twinkle_speed
-        alpha = int(150 + 105 * math.sin(self.twinkle_timer))
-        self.image.set_alpha(alpha)
 
-class Particle(pygame.sprite.Sprite):
-    def __init__(self, groups, x, y, color, size_range=(2,6), speed_range=(50, 250), 
-                 life_range=(0.3, 1.2), gravity=0):
-        super().__init__(groups)
-        self._layer = LAYER_PARTICLE
-        
-        size = random.randint(*size_range)
-        self.image = pygame.Surface((size, size), pygame.SRCALPHA)
-        
-        # Glow effect for particles
-        for i in range(size, 0, -1):
-            alpha = int(255 * (1 - i / size))
-            glow_color = (*color[:3], alpha)
-            pygame.draw.circle(self.image, glow_color, (size//2, size//2), i//2)
-        
-        self.rect = self.image.get_rect(center=(x, y))
-        
-        angle = random.uniform(0, 360)
-        speed = random.uniform(*speed_range)
-        self.velocity = pygame.math.Vector2(speed, 0).rotate(angle)
-        
-        self.life = random.uniform(*life_range)
-        self.initial_life = self.life
-        self.color = color
-        self.gravity = gravity
+    def draw(self, surface, offset=(0, 0), dirty=None, alpha=1.0):
+        top = self.TWINKLE_LEVELS - 1
+        levels = np.rint((0.5 + 0.5 * np.sin(self.twinkle_timer)) * top).astype(np.intp)
+        topleft = interpolate(self.prev_pos, self.pos, alpha).astype(np.int32) - self.half_size[:, None] + np.array(offset, dtype=np.int32)
 
-    def update(self, dt):
-        self.velocity.y += self.gravity * dt
-        self.rect.centerx += self.velocity.x * dt
-        self.rect.centery += self.velocity.y * dt
-        self.life -= dt
-        
-        if self.life <= 0:
-            self.kill()
+        stamps = self.stamps
+        rects = surface.blits([(stamps[i], (x, y)) for i, (x, y)
+                               in zip((self.stamp_base + levels).tolist(), topleft.tolist())],
+                              dirty is not None)
+        if dirty is not None:
+            dirty.extend(rects)
+
+class SlotStore:
+    """Slot bookkeeping shared by the array-backed stores.
+
+    Each item is a slot across a store's parallel NumPy arrays; alive marks
+    the live slots and free is a stack of free slot indices, popped from
+    the end so the lowest slots are handed out first. Stores advance every
+    slot in their vectorized update, dead ones included, as that is cheaper
+    than masking every buffer, and hand the expired ones to reclaim.
+    """
+    def __init__(self, capacity):
+        self.capacity = 0
+        self.alive = np.zeros(0, dtype=bool)
+        self.free = []
+        self.grow_slots(capacity)
+
+    def __len__(self):
+        return self.capacity - len(self.free)
+
+    def grow_slots(self, capacity):
+        """Extend alive and the free list to capacity slots; stores grow
+        their own arrays first"""
+        alive = np.zeros(capacity, dtype=bool)
+        alive[:self.capacity] = self.alive
+        self.alive = alive
+        self.free = list(range(capacity - 1, self.capacity - 1, -1)) + self.free
+        self.capacity = capacity
+
+    def active(self):
+        """Indices of live slots, in slot order"""
+        return np.flatnonzero(self.alive)
+
+    def allocate(self, count):
+        """Mark up to count free slots live and return their indices, or
+        None when none are free"""
+        count = min(count, len(self.free))
+        if count <= 0:
+            return None
+        idx = np.array(self.free[-count:], dtype=np.intp)
+        del self.free[-count:]
+        self.alive[idx] = True
+        return idx
+
+    def allocate_one(self):
+        """Mark one free slot live and return it, or None when full"""
+        if not self.free:
+            return None
+        i = self.free.pop()
+        self.alive[i] = True
+        return i
+
+    def kill(self, i):
+        if self.alive[i]:
+            self.alive[i] = False
+            self.free.append(int(i))
+
+    def reclaim(self, expired):
+        """Free every live slot where the boolean array expired is set"""
+        gone = self.alive & expired
+        if gone.any():
+            self.alive &= ~gone
+            self.free.extend(np.flatnonzero(gone).tolist())
+
+class ParticleSystem(SlotStore):
+    """Fixed-capacity particle pool backed by NumPy buffers.
+
+    Position, velocity, life and colour live in preallocated arrays and are
+    advanced together in a single vectorized step. Dead slots go back on a
+    free list and are reused by the next emission. Rendering blits prebaked
+    glow stamps, one per (style, alpha level), shared by every particle.
+    """
+    ALPHA_LEVELS = 16
+
+    def __init__(self, capacity=4096):
+        super().__init__(capacity)
+        self.pos = np.zeros((capacity, 2), dtype=np.float32)
+        self.prev_pos = np.zeros((capacity, 2), dtype=np.float32)
+        self.vel = np.zeros((capacity, 2), dtype=np.float32)
+        self.life = np.zeros(capacity, dtype=np.float32)
+        self.initial_life = np.ones(capacity, dtype=np.float32)
+        self.gravity = np.zeros(capacity, dtype=np.float32)
+        self.peak_alpha = np.zeros(capacity, dtype=np.float32)
+        self.style = np.zeros(capacity, dtype=np.int32)
+        self.half_size = np.zeros(capacity, dtype=np.int32)
+
+        # Style id -> glow stamps for each alpha level
+        self.style_ids = {}
+        self.stamps = []
+
+        # Quality knobs: share of each burst emitted, and scale on its largest size
+        self.emission = 1.0
+        self.glow = 1.0
+
+    def get_style(self, color, size, solid=False):
+        """Return the style id for (color, size, solid), baking stamps on first use"""
+        key = (tuple(color[:3]), size, solid)
+        style = self.style_ids.get(key)
+        if style is None:
+            style = len(self.stamps)
+            self.style_ids[key] = style
+            self.stamps.append(self.bake_stamps(*key))
+        return style
+
+    def bake_stamps(self, color, size, solid):
+        kind = "dot" if solid else "glow"
+        return [ASSETS.get(kind, size, color, alpha=255 * level // (self.ALPHA_LEVELS - 1)).image
+                for level in range(self.ALPHA_LEVELS)]
+
+    def emit(self, x, y, color, count, size_range=(2, 6), speed_range=(50, 250),
+             life_range=(0.3, 1.2), gravity=0, jitter=(0, 0), peak_alpha=255, solid=False):
+        """Spawn a burst of particles at (x, y).
+
+        color may be a single RGB tuple or a sequence of them to pick from
+        per particle. jitter spreads spawn positions uniformly by +/- (dx, dy).
+        count and the top of size_range are scaled by emission and glow.
+        """
+        if self.emission < 1.0:
+            count = max(1, round(count * self.emission))
+        if self.glow < 1.0:
+            size_range = (size_range[0], max(size_range[0], round(size_range[1] * self.glow)))
+        # Particles past capacity are dropped
+        idx = self.allocate(count)
+        if idx is None:
             return
-        
-        # Smooth alpha fade
-        try:
-            alpha = int((self.life / self.initial_life) * 255)
-            alpha = max(0, min(255, alpha))  # Clamp to valid range
-            self.image.set_alpha(alpha)
-        except:
-            pass
-
-class TrailParticle(pygame.sprite.Sprite):
-    """Small trailing particles for bullets and enemies"""
-    def __init__(self, groups, x, y, color, size=3):
-        super().__init__(groups)
-        self._layer = LAYER_PARTICLE
-        self.image = pygame.Surface((size, size), pygame.SRCALPHA)
-        pygame.draw.circle(self.image, color, (size//2, size//2), size//2)
-        self.rect = self.image.get_rect(center=(x, y))
-        self.life = 0.15
-        self.initial_life = self.life
+        n = len(idx)
+        rng = RNG.particles
+
+        colors = [color] if isinstance(color[0], int) else list(color)
+        sizes = np.arange(size_range[0], size_range[1] + 1)
+        table = np.array([[self.get_style(c, int(s), solid) for s in sizes] for c in colors],
+                         dtype=np.int32)
+        size_idx = rng.integers(0, len(sizes), n)
+        color_idx = rng.integers(0, len(colors), n)
+        self.style[idx] = table[color_idx, size_idx]
+        self.half_size[idx] = sizes[size_idx] // 2
+
+        self.pos[idx, 0] = x + rng.integers(-jitter[0], jitter[0] + 1, n)
+        self.pos[idx, 1] = y + rng.integers(-jitter[1], jitter[1] + 1, n)
+        self.prev_pos[idx] = self.pos[idx]
+
+        angle = rng.uniform(0, 2 * math.pi, n)
+        speed = rng.uniform(speed_range[0], speed_range[1], n)
+        self.vel[idx, 0] = speed * np.cos(angle)
+        self.vel[idx, 1] = speed * np.sin(angle)
+
+        life = rng.uniform(life_range[0], life_range[1], n)
+        self.life[idx] = life
+        self.initial_life[idx] = np.maximum(life, 1e-6)
+        self.gravity[idx] = gravity
+        self.peak_alpha[idx] = peak_alpha
+
+    def trail(self, x, y, color, size=3):
+        """Small stationary trailing particles for enemies.
+
+        x and y may be scalars or equal-length arrays, one particle each.
+        """
+        x = np.atleast_1d(x)
+        idx = self.allocate(len(x))
+        if idx is None:
+            return
+        n = len(idx)
+        self.style[idx] = self.get_style(color, size, solid=True)
+        self.half_size[idx] = size // 2
+        self.pos[idx, 0] = x[:n]
+        self.pos[idx, 1] = np.atleast_1d(y)[:n]
+        self.prev_pos[idx] = self.pos[idx]
+        self.vel[idx] = 0
+        self.life[idx] = self.initial_life[idx] = 0.15
+        self.gravity[idx] = 0
+        self.peak_alpha[idx] = 200
 
     def update(self, dt):
+        self.prev_pos[:] = self.pos
+        self.vel[:, 1] += self.gravity * dt
+        self.pos += self.vel * dt
         self.life -= dt
-        if self.life <= 0:
-            self.kill()
+        self.reclaim(self.life <= 0)
+
+    def draw(self, surface, offset=(0, 0), dirty=None, alpha=1.0):
+        idx = self.active()
+        if len(idx) == 0:
             return
-        try:
-            alpha = int((self.life / self.initial_life) * 200)
-            alpha = max(0, min(255, alpha))
-            self.image.set_alpha(alpha)
-        except:
-            pass
-
-class Bullet(pygame.sprite.Sprite):
-    def __init__(self, all_sprites, bullets_group, x, y, angle=0, speed=BULLET_SPEED):
-        super().__init__(all_sprites, bullets_group)
-        self._layer = LAYER_BULLET
-        
-        # Enhanced bullet with glow
-        self.image = pygame.Surface((8, 18), pygame.SRCALPHA)
-        
-        # Outer glow
-        pygame.draw.ellipse(self.image, (*COLOR_BULLET, 100), (0, 0, 8, 18))
-        # Core
-        pygame.draw.ellipse(self.image, COLOR_BULLET, (1, 1, 6, 16))
-        # Highlight
-        pygame.draw.ellipse(self.image, (255, 150, 150), (2, 2, 4, 8))
-        
-        if angle != 0:
-            self.image = pygame.transform.rotate(self.image, -angle)
-        
-        self.rect = self.image.get_rect(center=(x, y))
-        self.mask = pygame.mask.from_surface(self.image)
-        
-        # Velocity for angled shots
-        self.velocity = pygame.math.Vector2(0, -speed).rotate(angle)
-        self.position = pygame.math.Vector2(x, y)
-        
-        self.trail_timer = 0
-        self.all_sprites = all_sprites
+
+        # Smooth alpha fade, quantized to the prebaked stamp levels
+        fade = np.clip(self.life[idx] / self.initial_life[idx], 0, 1) * self.peak_alpha[idx]
+        levels = (fade * ((self.ALPHA_LEVELS - 1) / 255) + 0.5).astype(np.intp)
+        topleft = interpolate(self.prev_pos[idx], self.pos[idx], alpha).astype(np.int32) - self.half_size[idx, None] + np.array(offset, dtype=np.int32)
+
+        stamps = self.stamps
+        rects = surface.blits([(stamps[s][l], (x, y)) for s, l, (x, y)
+                               in zip(self.style[idx].tolist(), levels.tolist(), topleft.tolist())],
+                              dirty is not None)
+        if dirty is not None:
+            dirty.extend(rects)
+
+class BulletPool(SlotStore):
+    """Fixed-capacity store for every player bullet.
+
+    Bullets are slots across parallel NumPy arrays, advanced and culled in
+    one vectorized step; shots past capacity are dropped. Each bullet
+    draws a fading streak back to where it was TRAIL_TIME seconds ago
+    instead of dropping trail particles.
+    """
+    TRAIL_TIME = 0.15
+    TRAIL_SEGMENTS = 3
+    TRAIL_COLOR = (255, 100, 100)
+
+    def __init__(self, capacity=256):
+        super().__init__(capacity)
+        self.pos = np.zeros((capacity, 2), dtype=np.float64)
+        self.prev_pos = np.zeros((capacity, 2), dtype=np.float64)
+        self.vel = np.zeros((capacity, 2), dtype=np.float64)
+        self.age = np.zeros(capacity, dtype=np.float64)
+        self.kind = np.zeros(capacity, dtype=np.int32)
+        self.center = np.zeros((capacity, 2), dtype=np.int32)
+
+        # Angle -> kind, with cached art, hitbox and half extents per kind
+        self.kinds = {}
+        self.images = []
+        self.hitboxes = []
+        self.half = np.zeros((0, 2), dtype=np.int32)
+        for angle in (0, -20, 20):
+            self.get_kind(angle)
+
+        # Streak segments drawn, nearest the bullet first; lowered by the quality governor
+        self.trail_segments = self.TRAIL_SEGMENTS
+        # Streak colors fade from the trail color into the background
+        self.trail_colors = [
+            tuple(int(c + (b - c) * k / self.TRAIL_SEGMENTS) for c, b in zip(self.TRAIL_COLOR, COLOR_BG))
+            for k in range(self.TRAIL_SEGMENTS)
+        ]
+
+    def get_kind(self, angle):
+        kind = self.kinds.get(angle)
+        if kind is None:
+            asset = ASSETS.get("bullet", (8, 18), COLOR_BULLET, angle)
+            kind = self.kinds[angle] = len(self.images)
+            self.images.append(asset.image)
+            self.hitboxes.append(asset.hitbox)
+            self.half = np.vstack((self.half, np.array(asset.image.get_size()) // 2))
+        return kind
+
+    def spawn(self, x, y, angle=0, speed=BULLET_SPEED):
+        i = self.allocate_one()
+        if i is None:
+            return None
+        # Velocity for angled shots, as Vector2(0, -speed).rotate(angle)
+        rad = math.radians(angle)
+        self.vel[i] = speed * math.sin(rad), -speed * math.cos(rad)
+        self.pos[i] = self.prev_pos[i] = x, y
+        self.center[i] = x, y
+        self.age[i] = 0
+        self.kind[i] = self.get_kind(angle)
+        return i
 
     def update(self, dt):
-        self.position += self.velocity * dt
-        self.rect.center = round(self.position.x), round(self.position.y)
-        
-        # Spawn trail
-        self.trail_timer += dt
-        if self.trail_timer > 0.02:
-            self.trail_timer = 0
-            TrailParticle(self.all_sprites, self.rect.centerx, self.rect.centery, 
-                         (255, 100, 100), size=4)
-        
-        if (self.rect.bottom < 0 or self.rect.top > SCREEN_HEIGHT or 
-            self.rect.right < 0 or self.rect.left > SCREEN_WIDTH):
-            self.kill()
+        self.prev_pos[:] = self.pos
+        self.pos += self.vel * dt
+        self.age += dt
+        np.rint(self.pos, out=self.center, casting="unsafe")
+
+        half = self.half[self.kind]
+        self.reclaim((self.center[:, 1] + half[:, 1] < 0) | (self.center[:, 1] - half[:, 1] > SCREEN_HEIGHT) |
+                     (self.center[:, 0] + half[:, 0] < 0) | (self.center[:, 0] - half[:, 0] > SCREEN_WIDTH))
+
+    def rect(self, i):
+        w, h = self.images[self.kind[i]].get_size()
+        return pygame.Rect(int(self.center[i, 0]) - w // 2, int(self.center[i, 1]) - h // 2, w, h)
+
+    def draw(self, surface, offset=(0, 0), dirty=None, alpha=1.0):
+        idx = self.active()
+        if len(idx) == 0:
+            return
+        shift = np.array(offset)
+        pos = interpolate(self.prev_pos[idx], self.pos[idx], alpha)
+
+        # Streak: segments from the bullet back to its position TRAIL_TIME ago
+        if self.trail_segments > 0:
+            head = pos + shift
+            tail = head - self.vel[idx] * np.minimum(self.age[idx], self.TRAIL_TIME)[:, None]
+            steps = np.linspace(0, 1, self.TRAIL_SEGMENTS + 1)
+            points = (head[:, None] + (tail - head)[:, None] * steps[None, :, None]).astype(np.int32).tolist()
+            colors = self.trail_colors[:self.trail_segments]
+            for streak in points:
+                for k, color in enumerate(colors):
+                    rect = paint(surface, pygame.draw.line, color, streak[k], streak[k + 1], self.TRAIL_SEGMENTS + 1 - k)
+                    if dirty is not None:
+                        dirty.append(rect)
+
+        center = self.center[idx] if alpha >= 1.0 else np.rint(pos).astype(np.int32)
+        topleft = center - self.half[self.kind[idx]] + shift.astype(np.int32)
+        images = self.images
+        rects = surface.blits([(images[k], (x, y)) for k, (x, y)
+                               in zip(self.kind[idx].tolist(), topleft.tolist())], dirty is not None)
+        if dirty is not None:
+            dirty.extend(rects)
+
+class SpritePool:
+    """Recycles dead sprites per key instead of building new ones.
+
+    factory(key, groups, *args) builds a sprite and sprite.reset(*args)
+    revives a pooled one; sprites hand themselves back with release when
+    killed. hits counts spawns served from the pool, misses the ones that
+    had to build a new sprite.
+    """
+    def __init__(self, factory):
+        self.factory = factory
+        self.free = {}
+        self.hits = 0
+        self.misses = 0
+
+    def __len__(self):
+        return sum(len(free) for free in self.free.values())
+
+    def acquire(self, key, groups, *args):
+        free = self.free.get(key)
+        if free:
+            sprite = free.pop()
+            sprite.reset(*args)
+            sprite.add(groups)
+            self.hits += 1
+        else:
+            sprite = self.factory(key, groups, *args)
+            self.misses += 1
+        return sprite
+
+    def release(self, key, sprite):
+        self.free.setdefault(key, []).append(sprite)
+
+    def prewarm(self, key, count, *args):
+        """Park new sprites until count are free for key"""
+        free = self.free.setdefault(key, [])
+        while len(free) < count:
+            free.append(self.factory(key, (), *args))
 
 class PowerUp(pygame.sprite.Sprite):
-    def __init__(self, groups, x, y, powerup_type: PowerUpType):
+    def __init__(self, groups, x, y, powerup_type: PowerUpType, pool=None):
         super().__init__(groups)
         self._layer = LAYER_POWERUP
-        
+
         self.powerup_type = powerup_type
-        config = POWERUP_CONFIGS[powerup_type]
-        
-        # Create pulsing power-up visual
-        size = 30
-        self.image = pygame.Surface((size, size), pygame.SRCALPHA)
-        self.original_image = self.image.copy()
-        
-        self.rect = self.image.get_rect(center=(x, y))
+        self.config = POWERUP_CONFIGS[powerup_type]
+        self.pool = pool
+
+        # Pulsing, rotating visual comes from the prebaked strip
+        self.strip = ASSETS.powerup_strip(powerup_type)
         self.position = pygame.math.Vector2(x, y)
         self.velocity = pygame.math.Vector2(0, 150)
-        
+        self.reset(x, y)
+
+    def reset(self, x, y):
+        self.frame = self.strip[0][0]
+        self.image = self.frame.image
+        self.rect = self.image.get_rect(center=(x, y))
+        self.position.update(x, y)
+
         self.pulse_timer = 0
         self.rotation = 0
-        self.config = config
-        
-        self.render_powerup(size, 1.0)
-
-    def render_powerup(self, size, scale):
-        self.image = pygame.Surface((size, size), pygame.SRCALPHA)
-        color = self.config.color
-        
-        # Outer glow
-        for i in range(5, 0, -1):
-            alpha = int(100 * (1 - i/5) * scale)
-            pygame.draw.circle(self.image, (*color, alpha), (size//2, size//2), size//2 - i)
-        
-        # Core shape
-        inner_size = int((size - 10) * scale)
-        pygame.draw.circle(self.image, color, (size//2, size//2), inner_size//2)
-        
-        # Symbol
-        font = pygame.font.Font(None, 24)
-        text = font.render(self.config.symbol, True, (255, 255, 255))
-        text_rect = text.get_rect(center=(size//2, size//2))
-        self.image.blit(text, text_rect)
+
+    def kill(self):
+        # Dead power-ups go back to their pool for the next spawn
+        if self.alive():
+            super().kill()
+            if self.pool is not None:
+                self.pool.release(self.powerup_type, self)
+
+    @property
+    def mask(self):
+        return self.frame.mask
 
     def update(self, dt):
         self.position += self.velocity * dt
-        self.rect.center = round(self.position.x), round(self.position.y)
-        
-        # Pulse animation
+
+        # Pulse and rotation animation
         self.pulse_timer += dt * 4
-        scale = 0.9 + 0.1 * math.sin(self.pulse_timer)
-        self.render_powerup(30, scale)
-        
-        # Rotation
         self.rotation += dt * 90
-        self.image = pygame.transform.rotate(self.original_image, self.rotation)
-        self.rect = self.image.get_rect(center=self.rect.center)
-        
+        pulse = int(self.pulse_timer / math.tau * POWERUP_PULSE_FRAMES) % POWERUP_PULSE_FRAMES
+        step = int(self.rotation / 360 * POWERUP_ROTATION_FRAMES) % POWERUP_ROTATION_FRAMES
+        self.frame = self.strip[pulse][step]
+        self.image = self.frame.image
+        self.rect = self.image.get_rect(center=(round(self.position.x), round(self.position.y)))
+
         if self.rect.top > SCREEN_HEIGHT:
             self.kill()
 
-class Enemy(pygame.sprite.Sprite):
-    def __init__(self, groups, speed_modifier=0, enemy_type="normal"):
-        super().__init__(groups)
-        self._layer = LAYER_ENEMY
-        
-        self.enemy_type = enemy_type
-        self.create_image()
-        
-        self.rect = self.image.get_rect(center=(random.randint(40, SCREEN_WIDTH-40), -30))
-        
-        if enemy_type == "fast":
-            self.speed_y = random.randint(ENEMY_MIN_SPEED + 100, int(ENEMY_MAX_SPEED + 150 + speed_modifier))
-            self.hp = 1
-        elif enemy_type == "tank":
-            self.speed_y = random.randint(ENEMY_MIN_SPEED - 20, int(ENEMY_MAX_SPEED - 50 + speed_modifier))
-            self.hp = 3
-        elif enemy_type == "boss":
-            self.speed_y = random.randint(ENEMY_MIN_SPEED - 40, int(ENEMY_MAX_SPEED - 100 + speed_modifier))
-            self.hp = 10
-        else:  # normal
-            self.speed_y = random.randint(ENEMY_MIN_SPEED, int(ENEMY_MAX_SPEED + speed_modifier))
-            self.hp = 2
-        
-        self.max_hp = self.hp
-        
-        # Enhanced sine wave AI
-        self.t = random.uniform(0, 360)
-        if enemy_type == "boss":
-            self.freq = random.uniform(0.8, 1.5)
-            self.amp = random.uniform(100, 200)
-        else:
-            self.freq = random.uniform(1.5, 4)
-            self.amp = random.uniform(60, 180)
-        
-        self.center_x = float(self.rect.centerx)
-        self.position = pygame.math.Vector2(self.rect.center)
-        
-        self.trail_timer = 0
-        self.hit_flash = 0
-
-    def create_image(self):
-        """Create enemy sprite based on type"""
-        if self.enemy_type == "boss":
-            size = 80
-            self.image = pygame.Surface((size, size), pygame.SRCALPHA)
-            
-            # Boss design - menacing large enemy
-            color = (200, 0, 150)
-            
-            # Outer spiky shell
-            points = []
-            for i in range(8):
-                angle = i * 45
-                rad = size // 2 if i % 2 == 0 else size // 3
-                x = size//2 + rad * math.cos(math.radians(angle))
-                y = size//2 + rad * math.sin(math.radians(angle))
-                points.append((x, y))
-            pygame.draw.polygon(self.image, color, points)
-            
-            # Inner core
-            pygame.draw.circle(self.image, (255, 50, 255), (size//2, size//2), size//4)
-            
-            # Glowing center
-            for i in range(3, 0, -1):
-                alpha = int(200 * (1 - i/3))
-                pygame.draw.circle(self.image, (*color, alpha), (size//2, size//2), i * 8)
-            
-            # Add some detail lines
-            pygame.draw.circle(self.image, (255, 200, 255), (size//2, size//2), size//5, 2)
-            
-        elif self.enemy_type == "tank":
-            # Large, tough enemy
-            size = 35
-            self.image = pygame.Surface((size, size), pygame.SRCALPHA)
-            color = (200, 0, 200)
-            pygame.draw.polygon(self.image, color, 
-                              [(size//2, 0), (size, size//2), (size//2, size), (0, size//2)])
-            pygame.draw.polygon(self.image, (255, 100, 255), 
-                              [(size//2, 5), (size-5, size//2), (size//2, size-5), (5, size//2)])
-        elif self.enemy_type == "fast":
-            # Small, fast enemy
-            size = 25
-            self.image = pygame.Surface((size, size), pygame.SRCALPHA)
-            color = (255, 50, 255)
-            points = []
-            for i in range(6):
-                angle = i * 60
-                rad = size // 2 if i % 2 == 0 else size // 4
-                x = size//2 + rad * math.cos(math.radians(angle))
-                y = size//2 + rad * math.sin(math.radians(angle))
-                points.append((x, y))
-            pygame.draw.polygon(self.image, color, points)
-            pygame.draw.polygon(self.image, (255, 150, 255), 
-                              [(p[0] * 0.7 + size//2 * 0.3, p[1] * 0.7 + size//2 * 0.3) for p in points])
+@dataclass
+class EnemyStats:
+    hp: int
+    speed: Tuple[int, int]
+    freq: Tuple[float, float]
+    amp: Tuple[float, float]
+
+ENEMY_STATS = {
+    "normal": EnemyStats(2, (ENEMY_MIN_SPEED, ENEMY_MAX_SPEED), (1.5, 4), (60, 180)),
+    "fast": EnemyStats(1, (ENEMY_MIN_SPEED + 100, ENEMY_MAX_SPEED + 150), (1.5, 4), (60, 180)),
+    "tank": EnemyStats(3, (ENEMY_MIN_SPEED - 20, ENEMY_MAX_SPEED - 50), (1.5, 4), (60, 180)),
+    "boss": EnemyStats(10, (ENEMY_MIN_SPEED - 40, ENEMY_MAX_SPEED - 100), (0.8, 1.5), (100, 200)),
+}
+ENEMY_TYPES = tuple(ENEMY_STATS)
+
+class EnemyFleet(SlotStore):
+    """Struct-of-arrays store for every enemy on the field.
+
+    Each enemy is a slot across parallel NumPy arrays. Sine-wave motion,
+    culling and hit-flash timers run as batch operations over all slots,
+    and drawing blits cached per-type surfaces, so nothing is copied per
+    enemy per frame. Hit flashes pick one of FLASH_LEVELS prebaked
+    intensity frames by quantized hit_flash. Slots are recycled through a
+    free list and the arrays double in size when full.
+    """
+    FLASH_LEVELS = 8
+
+    FIELDS = {
+        "center_x": np.float64,
+        "y": np.float64,
+        "t": np.float64,
+        "freq": np.float64,
+        "amp": np.float64,
+        "speed_y": np.float64,
+        "hit_flash": np.float64,
+        "hp": np.int32,
+        "max_hp": np.int32,
+        "kind": np.int32,
+        "size": np.int32,
+        "cx": np.int32,
+        "cy": np.int32,
+        "prev_cx": np.int32,
+        "prev_cy": np.int32,
+    }
+
+    def __init__(self, capacity=256):
+        super().__init__(0)
+        for name, dtype in self.FIELDS.items():
+            setattr(self, name, np.zeros(0, dtype=dtype))
+        self.grow(capacity)
+
+        # Spawns served from free slots vs ones that had to grow the arrays
+        self.hits = 0
+        self.misses = 0
+
+        # Per-type flash frames from plain to full white, indexed by
+        # kind * FLASH_LEVELS + level
+        self.images = [ASSETS.enemy(enemy_type, flash=255 * level // (self.FLASH_LEVELS - 1)).image
+                       for enemy_type in ENEMY_TYPES for level in range(self.FLASH_LEVELS)]
+        self.hitboxes = [ASSETS.enemy(enemy_type).hitbox for enemy_type in ENEMY_TYPES]
+        self.boss_kind = ENEMY_TYPES.index("boss")
+
+    def reserve(self, count):
+        """Grow ahead of time so count enemies fit without a mid-wave resize"""
+        capacity = self.capacity
+        while capacity < count:
+            capacity *= 2
+        if capacity != self.capacity:
+            self.grow(capacity)
+
+    def grow(self, capacity):
+        for name, dtype in self.FIELDS.items():
+            grown = np.zeros(capacity, dtype=dtype)
+            grown[:self.capacity] = getattr(self, name)
+            setattr(self, name, grown)
+        self.grow_slots(capacity)
+
+    def spawn(self, enemy_type, speed_modifier=0, y=-30):
+        if self.free:
+            self.hits += 1
         else:
-            # Normal enemy
-            size = 30
-            self.image = pygame.Surface((size, size), pygame.SRCALPHA)
-            color = COLOR_ENEMY
-            pygame.draw.polygon(self.image, color, 
-                              [(size//2, 0), (size, size//2), (size//2, size), (0, size//2)])
-            pygame.draw.polygon(self.image, (255, 200, 255), 
-                              [(size//2, 5), (size-5, size//2), (size//2, size-5), (5, size//2)])
-        
-        self.original_image = self.image.copy()
-        self.mask = pygame.mask.from_surface(self.image)
+            self.misses += 1
+            self.grow(self.capacity * 2)
+        i = self.allocate_one()
+
+        stats = ENEMY_STATS[enemy_type]
+        rng = RNG.enemies
+        self.center_x[i] = rng.randint(40, SCREEN_WIDTH-40)
+        # A negative modifier (slow waves or loops) can't empty the range
+        low, high = stats.speed
+        self.speed_y[i] = rng.randint(low, max(low, int(high + speed_modifier)))
+
+        # Enhanced sine wave AI
+        self.t[i] = rng.uniform(0, 360)
+        self.freq[i] = rng.uniform(*stats.freq)
+        self.amp[i] = rng.uniform(*stats.amp)
+
+        self.y[i] = y
+        self.cx[i] = self.prev_cx[i] = self.center_x[i]
+        self.cy[i] = self.prev_cy[i] = round(y)
+        self.hp[i] = self.max_hp[i] = stats.hp
+        self.kind[i] = ENEMY_TYPES.index(enemy_type)
+        self.size[i] = ENEMY_ART[enemy_type][0]
+        self.hit_flash[i] = 0
+        return i
+
+    def take_damage(self, i, damage=1):
+        self.hp[i] -= damage
+        self.hit_flash[i] = 1.0
+        return self.hp[i] <= 0
+
+    def enemy_type(self, i):
+        return ENEMY_TYPES[self.kind[i]]
 
     def update(self, dt):
-        self.position.y += self.speed_y * dt
+        self.prev_cx[:] = self.cx
+        self.prev_cy[:] = self.cy
+        self.y += self.speed_y * dt
         self.t += dt
-        
+
         # Sine wave movement
-        offset_x = math.sin(self.t * self.freq) * self.amp
-        self.rect.centerx = round(self.center_x + offset_x)
-        self.rect.centery = round(self.position.y)
-        
-        # Hit flash effect
-        if self.hit_flash > 0:
-            self.hit_flash -= dt * 5
-            if self.hit_flash > 0:
-                flash_surf = self.original_image.copy()
-                alpha = max(0, min(255, int(self.hit_flash * 255)))
-                try:
-                    flash_surf.fill((255, 255, 255, alpha), special_flags=pygame.BLEND_RGB_ADD)
-                    self.image = flash_surf
-                except ValueError:
-                     self.image = self.original_image.copy()
-            else:
-                self.image = self.original_image.copy()
-        else:
-            self.image = self.original_image.copy()
-        
-        # Trail particles
-        self.trail_timer += dt
-        if self.trail_timer > 0.08:
-            self.trail_timer = 0
-            # Will be added by game class
-        
-        if self.rect.top > SCREEN_HEIGHT:
-            self.kill()
+        np.rint(self.center_x + np.sin(self.t * self.freq) * self.amp, out=self.cx, casting="unsafe")
+        np.rint(self.y, out=self.cy, casting="unsafe")
+
+        # Hit flash decay
+        np.maximum(self.hit_flash - dt * 5, 0, out=self.hit_flash)
+
+        # Cull enemies that have left the bottom of the screen
+        self.reclaim(self.cy - self.size // 2 > SCREEN_HEIGHT)
+
+    def bounds(self, idx):
+        """(n, 4) array of left, top, right, bottom for the given slots"""
+        left = self.cx[idx] - self.size[idx] // 2
+        top = self.cy[idx] - self.size[idx] // 2
+        return np.column_stack((left, top, left + self.size[idx], top + self.size[idx]))
+
+    def rect(self, i):
+        size = int(self.size[i])
+        return pygame.Rect(int(self.cx[i]) - size // 2, int(self.cy[i]) - size // 2, size, size)
+
+    def overlaps(self, i, rect, hitbox=None, precision=CollisionPrecision.PIXEL):
+        """Rect test, then the tiered hitbox test when hitbox is given, against enemy i"""
+        enemy_rect = self.rect(i)
+        if not rect.colliderect(enemy_rect):
+            return False
+        if hitbox is None:
+            return True
+        enemy_hitbox = self.hitboxes[self.kind[i]]
+        if precision is CollisionPrecision.PIXEL:
+            # The rects already overlap, so go straight to the masks
+            offset = (enemy_rect.x - rect.x, enemy_rect.y - rect.y)
+            return hitbox.mask.overlap(enemy_hitbox.mask, offset) is not None
+        return hitboxes_collide(hitbox, rect.topleft, enemy_hitbox, enemy_rect.topleft, precision)
+
+    def draw(self, surface, offset=(0, 0), dirty=None, alpha=1.0):
+        idx = self.active()
+        if len(idx) == 0:
+            return
+        # Any flash at all shows at least the faintest flash frame
+        levels = np.ceil(self.hit_flash[idx] * (self.FLASH_LEVELS - 1)).astype(np.int32)
+        keys = self.kind[idx] * self.FLASH_LEVELS + levels
+        cx = interpolate(self.prev_cx[idx], self.cx[idx], alpha).astype(np.int32)
+        cy = interpolate(self.prev_cy[idx], self.cy[idx], alpha).astype(np.int32)
+        half = self.size[idx] // 2
+        topleft = np.column_stack((cx - half + offset[0], cy - half + offset[1]))
+
+        images = self.images
+        rects = surface.blits([(images[k], (x, y)) for k, (x, y) in zip(keys.tolist(), topleft.tolist())],
+                              dirty is not None)
+        if dirty is not None:
+            dirty.extend(rects)
+
+        for k in np.flatnonzero(self.kind[idx] == self.boss_kind):
+            bar = self.draw_hp_bar(surface, idx[k], (cx[k] + offset[0], cy[k] + offset[1]))
+            if dirty is not None and bar is not None:
+                dirty.append(bar)
 
-    def draw_hp_bar(self, surface):
+    def draw_hp_bar(self, surface, i, center):
         """Draw HP bar above boss enemies"""
-        if self.enemy_type == "boss" and self.hp > 0 and hasattr(self, 'rect'):
+        if self.hp[i] > 0:
             bar_width = 60
             bar_height = 6
-            x = self.rect.centerx - bar_width // 2
-            y = self.rect.top - 15
-            
+            x = int(center[0]) - bar_width // 2
+            y = int(center[1]) - int(self.size[i]) // 2 - 15
+
             # Background
-            pygame.draw.rect(surface, (100, 0, 0), (x, y, bar_width, bar_height))
-            
+            paint(surface, pygame.draw.rect, (100, 0, 0), (x, y, bar_width, bar_height))
+
             # HP
-            hp_ratio = max(0, min(1, self.hp / self.max_hp))  # Clamp between 0 and 1
-            pygame.draw.rect(surface, (255, 0, 100), (x, y, int(bar_width * hp_ratio), bar_height))
-            
+            hp_ratio = max(0, min(1, self.hp[i] / self.max_hp[i]))  # Clamp between 0 and 1
+            paint(surface, pygame.draw.rect, (255, 0, 100), (x, y, int(bar_width * hp_ratio), bar_height))
+
             # Border
-            pygame.draw.rect(surface, (255, 255, 255), (x, y, bar_width, bar_height), 1)
+            return paint(surface, pygame.draw.rect, (255, 255, 255), (x, y, bar_width, bar_height), 1)
 
-    def take_damage(self, damage=1):
-        self.hp -= damage
-        self.hit_flash = 1.0
-        return self.hp <= 0
+def roll_enemy_type(rng):
+    """Pick an enemy type by ENEMY_SPAWN_WEIGHTS"""
+    roll = rng.random() * sum(ENEMY_SPAWN_WEIGHTS.values())
+    for enemy_type, weight in ENEMY_SPAWN_WEIGHTS.items():
+        if roll < weight:
+            break
+        roll -= weight
+    return enemy_type
+
+class WaveDirector:
+    """Plays wave definitions as a timeline of enemy spawns.
+
+    Each wave is compiled into (time, seq, type, speed) events, one wave
+    ahead of time so the game can prewarm for it, and pushed onto a heap
+    when it starts; due spawns are popped in O(log n) each. After the
+    last defined wave, the final one repeats with the "loop" scaling:
+    faster enemies and shorter spawn intervals on every pass.
+
+    Wave file format, times in seconds:
+
+        {"waves": [{"name": "Scouts", "duration": 25, "groups": [
+            {"type": "normal", "count": 18, "at": 0, "every": 0.9, "speed": 0}]}],
+         "loop": {"speed": 40, "every_scale": 0.9, "min_every": 0.25}}
+
+    A group's type may be "any" to roll one by ENEMY_SPAWN_WEIGHTS.
+    Durations, every_scale and min_every must be positive and counts,
+    every and at non-negative; every number must be finite. A negative
+    speed slows a group down to its type's slowest speed at most.
+    """
+    # Used when the wave file cannot be read or is invalid: the classic endless trickle
+    FALLBACK = {
+        "waves": [{"name": "Endless", "duration": 30, "groups": [{"type": "any", "count": 38, "every": 0.8}]}],
+        "loop": {"speed": 40, "every_scale": 0.9, "min_every": 0.25},
+    }
+
+    def __init__(self, waves, loop):
+        self.waves = waves
+        self.loop = loop
+        self.reset()
+
+    @classmethod
+    def load(cls, path=WAVES_PATH):
+        try:
+            with open(path) as f:
+                data = json.load(f)
+            cls.validate(data)
+        except KeyError as e:
+            print(f"Error loading waves from {path}: missing key {e}")
+            data = cls.FALLBACK
+        except (OSError, ValueError, TypeError) as e:
+            print(f"Error loading waves from {path}: {e}")
+            data = cls.FALLBACK
+        return cls(data["waves"], data.get("loop", cls.FALLBACK["loop"]))
+
+    @staticmethod
+    def validate(data):
+        """Raise ValueError unless data is a playable wave definition"""
+        def number(value, name, minimum=0, strict=False):
+            if isinstance(value, bool) or not isinstance(value, (int, float)) or not math.isfinite(value):
+                raise ValueError(f"{name} must be a finite number, got {value!r}")
+            if value < minimum or (strict and value == minimum):
+                raise ValueError(f"{name} must be {'>' if strict else '>='} {minimum}, got {value!r}")
+
+        waves = data["waves"]
+        if not isinstance(waves, list) or not waves:
+            raise ValueError("waves must be a non-empty list")
+        for n, wave in enumerate(waves, 1):
+            if not isinstance(wave.get("name", ""), str):
+                raise ValueError(f"wave {n} name must be a string, got {wave['name']!r}")
+            number(wave["duration"], f"wave {n} duration", strict=True)
+            for group in wave["groups"]:
+                if group["type"] != "any" and group["type"] not in ENEMY_STATS:
+                    raise ValueError(f"unknown enemy type {group['type']!r}")
+                count = group.get("count", 1)
+                if not isinstance(count, int) or isinstance(count, bool) or count < 0:
+                    raise ValueError(f"wave {n} count must be an integer >= 0, got {count!r}")
+                number(group.get("every", 0), f"wave {n} every")
+                number(group.get("at", 0), f"wave {n} at")
+                number(group.get("speed", 0), f"wave {n} speed", minimum=-math.inf)
+        if "loop" in data:
+            loop = data["loop"]
+            number(loop["speed"], "loop speed", minimum=-math.inf)
+            number(loop["every_scale"], "loop every_scale", strict=True)
+            number(loop["min_every"], "loop min_every", strict=True)
+
+    def reset(self):
+        self.clock = 0.0
+        self.heap = []
+        self.sequence = 0
+        self.upcoming = self.compile(1, 0.0)
+        self.start_next_wave()
+
+    def compile(self, number, start):
+        """Spawn events for wave number starting at clock time start.
+
+        Returns (number, start, end, events) with events sorted by time.
+        """
+        index = min(number, len(self.waves)) - 1
+        wave = self.waves[index]
+        passes = number - 1 - index
+        loop = self.loop
+
+        events = []
+        for group in wave["groups"]:
+            every = group.get("every", 0)
+            count = group.get("count", 1)
+            if passes and every:
+                # Shorter intervals, with the count scaled to fill the same span
+                scaled = max(loop["min_every"], every * loop["every_scale"] ** passes)
+                count = math.ceil(count * every / scaled)
+                every = scaled
+            speed = group.get("speed", 0) + passes * loop["speed"]
+            at = start + group.get("at", 0)
+            for k in range(count):
+                enemy_type = group["type"]
+                if enemy_type == "any":
+                    enemy_type = roll_enemy_type(RNG.spawns)
+                events.append((at + k * every, self.sequence, enemy_type, speed))
+                self.sequence += 1
+        events.sort()
+        return number, start, start + wave["duration"], events
+
+    def start_next_wave(self):
+        number, start, end, events = self.upcoming
+        self.wave = number
+        self.wave_start = start
+        self.wave_end = end
+        for event in events:
+            heapq.heappush(self.heap, event)
+        self.upcoming = self.compile(number + 1, end)
+
+    @property
+    def wave_name(self):
+        return self.waves[min(self.wave, len(self.waves)) - 1].get("name", "")
+
+    def advance(self, dt):
+        """Advance the clock and return the (enemy_type, speed) spawns now due"""
+        self.clock += dt
+        while self.clock >= self.wave_end:
+            self.start_next_wave()
+        due = []
+        heap = self.heap
+        while heap and heap[0][0] <= self.clock:
+            _, _, enemy_type, speed = heapq.heappop(heap)
+            due.append((enemy_type, speed))
+        return due
+
+@dataclass
+class InputState:
+    left: bool = False
+    right: bool = False
+    up: bool = False
+    down: bool = False
+    fire: bool = False
+
+    FIELDS = ("left", "right", "up", "down", "fire")
+
+    def to_bits(self):
+        return sum(1 << i for i, name in enumerate(self.FIELDS) if getattr(self, name))
+
+    @classmethod
+    def from_bits(cls, bits):
+        return cls(*(bool(bits & (1 << i)) for i in range(len(cls.FIELDS))))
+
+class InputPolicy:
+    """Source of player controls, consulted once per simulated frame.
+
+    begin_frame may override the frame's dt and restart request, which is
+    how recordings are replayed; it returns dt=None when input runs out.
+    sample is called on the main thread after every event pump, so policies
+    that read devices do it there rather than in poll, which runs on the
+    simulation thread when pipelined.
+    """
+    def begin_frame(self, dt, restart):
+        return dt, restart
+
+    def sample(self):
+        pass
+
+    def poll(self, game, dt):
+        return InputState()
+
+    def end_frame(self):
+        pass
+
+    def close(self):
+        pass
+
+class KeyboardPolicy(InputPolicy):
+    """Reads the player's controls from the keyboard and mouse"""
+    def __init__(self):
+        self.state = InputState()
+
+    def sample(self):
+        keys = pygame.key.get_pressed()
+        mouse = pygame.mouse.get_pressed()
+        # Swapped in whole, so the simulation thread never sees half a sample
+        self.state = InputState(
+            left=keys[pygame.K_a] or keys[pygame.K_LEFT],
+            right=keys[pygame.K_d] or keys[pygame.K_RIGHT],
+            up=keys[pygame.K_w] or keys[pygame.K_UP],
+            down=keys[pygame.K_s] or keys[pygame.K_DOWN],
+            fire=mouse[0] or keys[pygame.K_SPACE],
+        )
+
+    def poll(self, game, dt):
+        return self.state
+
+class AutopilotPolicy(InputPolicy):
+    """Simple bot for headless runs: always fires, lines up with the
+    lowest enemy and sidesteps anything about to reach the ship."""
+    def __init__(self, dead_zone=20, danger_height=180, danger_width=70):
+        self.dead_zone = dead_zone
+        self.danger_height = danger_height
+        self.danger_width = danger_width
+
+    def poll(self, game, dt):
+        state = InputState(fire=True)
+        player = game.player
+        px = player.rect.centerx
+        danger_line = player.rect.top - self.danger_height
+
+        fleet = game.enemies
+        idx = fleet.active()
+        _, top, _, bottom = fleet.bounds(idx).T
+        centerx = fleet.cx[idx]
+
+        threat = None
+        target = None
+        below = bottom > danger_line
+        threats = below & (np.abs(centerx - px) < self.danger_width) & (top < player.rect.bottom)
+        if threats.any():
+            threat = int(centerx[np.flatnonzero(threats)[-1]])
+        elif (~below).any():
+            target = int(centerx[np.flatnonzero(~below)[np.argmax(bottom[~below])]])
+
+        if threat is not None:
+            # Dodge toward the side with more room
+            dodge_left = threat > px
+            if px < 100 or px > SCREEN_WIDTH - 100:
+                dodge_left = px > SCREEN_WIDTH // 2
+            state.left = dodge_left
+            state.right = not dodge_left
+        elif target is not None:
+            dx = target - px
+            state.left = dx < -self.dead_zone
+            state.right = dx > self.dead_zone
+
+        # Stay near the bottom of the screen
+        state.down = player.rect.bottom < SCREEN_HEIGHT - 40
+        return state
+
+# Recording file: header (magic, seed) then one (input bits, dt) record per frame
+RECORDING_MAGIC = b"NEONREC1"
+RECORDING_HEADER = struct.Struct("<8sQ")
+RECORDING_FRAME = struct.Struct("<Bd")
+RESTART_BIT = 1 << len(InputState.FIELDS)
+
+class InputRecorder(InputPolicy):
+    """Wraps another policy and logs every frame's input bits and dt"""
+    def __init__(self, policy, path, seed):
+        self.policy = policy
+        self.file = open(path, "wb")
+        self.file.write(RECORDING_HEADER.pack(RECORDING_MAGIC, seed))
+        self.bits = 0
+
+    def begin_frame(self, dt, restart):
+        dt, restart = self.policy.begin_frame(dt, restart)
+        if dt is None:
+            return None, False
+        self.dt = dt
+        self.bits = RESTART_BIT if restart else 0
+        return dt, restart
+
+    def sample(self):
+        self.policy.sample()
+
+    def poll(self, game, dt):
+        state = self.policy.poll(game, dt)
+        self.bits |= state.to_bits()
+        return state
+
+    def end_frame(self):
+        self.policy.end_frame()
+        self.file.write(RECORDING_FRAME.pack(self.bits, self.dt))
+
+    def close(self):
+        self.policy.close()
+        self.file.close()
+
+class InputReplay(InputPolicy):
+    """Plays back a recording frame-for-frame, including its dt and restarts"""
+    def __init__(self, path):
+        with open(path, "rb") as f:
+            data = f.read()
+        magic, self.seed = RECORDING_HEADER.unpack_from(data)
+        if magic != RECORDING_MAGIC:
+            raise ValueError(f"{path} is not a Neon Assault recording")
+        self.frames = list(RECORDING_FRAME.iter_unpack(data[RECORDING_HEADER.size:]))
+        self.index = 0
+        self.state = InputState()
+
+    def __len__(self):
+        return len(self.frames)
+
+    def begin_frame(self, dt, restart):
+        if self.index >= len(self.frames):
+            return None, False
+        bits, dt = self.frames[self.index]
+        self.index += 1
+        self.state = InputState.from_bits(bits)
+        return dt, bool(bits & RESTART_BIT)
+
+    def poll(self, game, dt):
+        return self.state
 
 class Player(pygame.sprite.Sprite):
-    def __init__(self, groups, bullets_group):
+    def __init__(self, groups, bullets, particles, game, input_policy):
         super().__init__(groups)
         self._layer = LAYER_PLAYER
-        
-        # Enhanced player sprite with glow
-        size = (50, 60)
-        self.image = pygame.Surface(size, pygame.SRCALPHA)
-        
-        # Outer glow
-        for i in range(5):
-            alpha = int(80 * (1 - i/5))
-            glow_offset = i * 2
-            points = [(25, 0-glow_offset), (50+glow_offset, 60), (25, 50), (0-glow_offset, 60)]
-            pygame.draw.polygon(self.image, (*COLOR_PLAYER, alpha), points)
-        
-        # Main body
-        pygame.draw.polygon(self.image, COLOR_PLAYER, [(25, 0), (50, 60), (25, 50), (0, 60)])
-        # Highlight
-        pygame.draw.polygon(self.image, (200, 255, 255), [(25, 10), (35, 50), (25, 42), (15, 50)])
-        # Cockpit
-        pygame.draw.circle(self.image, (100, 255, 255), (25, 25), 5)
-        
-        self.original_image = self.image.copy()
-        self.mask = pygame.mask.from_surface(self.image)
-        
+
+        # Enhanced player sprite with glow; frames indexed by blink state
+        asset = ASSETS.get("player", (50, 60), COLOR_PLAYER)
+        self.frames = (asset.image, ASSETS.get("player", (50, 60), COLOR_PLAYER, alpha=128).image)
+        self.image = self.frames[0]
+        self.mask = asset.mask
+        self.hitbox = asset.hitbox
+
         self.rect = self.image.get_rect(center=(SCREEN_WIDTH // 2, SCREEN_HEIGHT - 100))
-        
+
         self.velocity = pygame.math.Vector2(0, 0)
         self.position = pygame.math.Vector2(self.rect.center)
-        
-        self.groups_ref = groups
-        self.bullets_group = bullets_group
+
+        self.bullets = bullets
+        self.particles = particles
+        self.game = game
+        self.input_policy = input_policy
         self.last_shot = 0
+
+        # Simulation clock, advanced by update so fixed-step runs stay in sync
+        self.time = 0.0
         self.shoot_delay = 0.15
-        
+
         # Health & Invulnerability
         self.max_health = 3
         self.health = self.max_health
         self.invulnerability_timer = 0
         self.invulnerability_duration = 2.0
-        
+
         # Power-ups
         self.active_powerups = {}
         self.has_shield = False
         self.shield_alpha = 0
-        
+
         # Engine glow
         self.engine_glow = 0
 
+        # Shield ring, a separate overlay sprite shown while shielded
+        self.shield = ShieldSprite(self)
+
     def update(self, dt):
+        self.time += dt
         self.handle_input(dt)
         self.apply_physics(dt)
         self.constrain_movement()
@@ -497,7 +1723,7 @@ class Player(pygame.sprite.Sprite):
             self.has_shield = False
             self.invulnerability_timer = 1.0 # Brief invuln after shield break
             return False
-            
+
         if self.invulnerability_timer <= 0:
             self.health -= damage
             self.invulnerability_timer = self.invulnerability_duration
@@ -505,22 +1731,21 @@ class Player(pygame.sprite.Sprite):
         return False
 
     def handle_input(self, dt):
-        keys = pygame.key.get_pressed()
-        mouse = pygame.mouse.get_pressed()
+        controls = self.input_policy.poll(self.game, dt)
         accel = pygame.math.Vector2(0, 0)
-        
-        if keys[pygame.K_a] or keys[pygame.K_LEFT]: accel.x = -PLAYER_ACCEL
-        if keys[pygame.K_d] or keys[pygame.K_RIGHT]: accel.x = PLAYER_ACCEL
-        if keys[pygame.K_w] or keys[pygame.K_UP]: accel.y = -PLAYER_ACCEL
-        if keys[pygame.K_s] or keys[pygame.K_DOWN]: accel.y = PLAYER_ACCEL
-        
+
+        if controls.left: accel.x = -PLAYER_ACCEL
+        if controls.right: accel.x = PLAYER_ACCEL
+        if controls.up: accel.y = -PLAYER_ACCEL
+        if controls.down: accel.y = PLAYER_ACCEL
+
         # Shooting
-        if mouse[0] or keys[pygame.K_SPACE]:
+        if controls.fire:
             self.shoot()
-            
+
         if accel.length() > 0:
             accel = accel.normalize() * PLAYER_ACCEL
-            if keys[pygame.K_w] or keys[pygame.K_UP]:
+            if controls.up:
                 self.spawn_thrusters()
                 self.engine_glow = 1.0
 
@@ -528,54 +1753,52 @@ class Player(pygame.sprite.Sprite):
 
     def spawn_thrusters(self):
         """Enhanced thruster particles"""
-        for _ in range(3):
-            offset_x = random.randint(-12, 12)
-            color = random.choice([(0, 255, 255), (0, 200, 255), (100, 255, 255)])
-            Particle(self.groups_ref, 
-                    self.rect.centerx + offset_x, 
-                    self.rect.bottom - 5, 
-                    color,
-                    size_range=(3, 6), 
-                    speed_range=(80, 150), 
-                    life_range=(0.15, 0.4),
-                    gravity=100)
+        self.particles.emit(self.rect.centerx, 
+                            self.rect.bottom - 5, 
+                            [(0, 255, 255), (0, 200, 255), (100, 255, 255)],
+                            3,
+                            size_range=(3, 6), 
+                            speed_range=(80, 150), 
+                            life_range=(0.15, 0.4),
+                            gravity=100,
+                            jitter=(12, 0))
 
     def shoot(self):
-        now = pygame.time.get_ticks() / 1000.0
-        
+        now = self.time
+
         # Rapid fire power-up
         shoot_delay = self.shoot_delay
         if PowerUpType.RAPID_FIRE in self.active_powerups:
             shoot_delay *= 0.4
-        
+
         if now - self.last_shot > shoot_delay:
             self.last_shot = now
-            
+
             # Spread shot power-up
             if PowerUpType.SPREAD_SHOT in self.active_powerups:
                 angles = [-20, 0, 20]
                 for angle in angles:
-                    Bullet(self.groups_ref, self.bullets_group, self.rect.centerx, self.rect.top, angle=angle)
+                    self.bullets.spawn(self.rect.centerx, self.rect.top, angle=angle)
             else:
-                Bullet(self.groups_ref, self.bullets_group, self.rect.centerx, self.rect.top)
-            
+                self.bullets.spawn(self.rect.centerx, self.rect.top)
+
             # Muzzle flash particles
-            for _ in range(4):
-                Particle(self.groups_ref, 
-                        self.rect.centerx + random.randint(-5, 5), 
-                        self.rect.top,
-                        (255, 200, 100),
-                        size_range=(2, 4),
-                        speed_range=(30, 80),
-                        life_range=(0.1, 0.2))
+            self.particles.emit(self.rect.centerx, 
+                                self.rect.top,
+                                (255, 200, 100),
+                                4,
+                                size_range=(2, 4),
+                                speed_range=(30, 80),
+                                life_range=(0.1, 0.2),
+                                jitter=(5, 0))
 
     def apply_physics(self, dt):
         self.velocity -= self.velocity * PLAYER_FRICTION * dt
-        
+
         # Speed cap
         if self.velocity.length() > PLAYER_MAX_SPEED:
             self.velocity.scale_to_length(PLAYER_MAX_SPEED)
-        
+
         self.position += self.velocity * dt
         self.rect.center = round(self.position.x), round(self.position.y)
 
@@ -600,7 +1823,7 @@ class Player(pygame.sprite.Sprite):
     def activate_powerup(self, powerup_type: PowerUpType):
         config = POWERUP_CONFIGS[powerup_type]
         self.active_powerups[powerup_type] = config.duration
-        
+
         if powerup_type == PowerUpType.SHIELD:
             self.has_shield = True
 
@@ -614,7 +1837,7 @@ class Player(pygame.sprite.Sprite):
                     self.has_shield = False
             else:
                 self.active_powerups[powerup_type] = time_left
-        
+
         for powerup_type in to_remove:
             del self.active_powerups[powerup_type]
 
@@ -623,98 +1846,749 @@ class Player(pygame.sprite.Sprite):
         # Engine glow decay
         if self.engine_glow > 0:
             self.engine_glow -= dt * 3
-        
+
         # Shield visual
         if self.has_shield:
-            self.shield_alpha = 100 + 50 * math.sin(pygame.time.get_ticks() / 200)
+            self.shield_alpha = 100 + 50 * math.sin(self.time * 5)
         else:
             self.shield_alpha = 0
-        
-        # Recreate image with effects
-        self.image = self.original_image.copy()
-        
+
         # Invulnerability Flash
-        if self.invulnerability_timer > 0:
-            flash_on = (int(pygame.time.get_ticks() / 100) % 2) == 0
-            if flash_on:
-                self.image.set_alpha(128)
+        blink = self.invulnerability_timer > 0 and (int(self.time * 10) % 2) == 0
+        self.image = self.frames[blink]
+
+        # Show or hide the shield overlay
+        if self.has_shield and not self.shield.alive():
+            self.shield.add(self.groups())
+            self.shield.update(dt)
+        elif not self.has_shield and self.shield.alive():
+            self.shield.kill()
+
+class ShieldSprite(pygame.sprite.Sprite):
+    """Pulsing shield ring drawn over the player.
+
+    Shield alpha is quantized to ALPHA_LEVELS prebaked frames, so the
+    pulse never allocates or draws a surface.
+    """
+    ALPHA_LEVELS = 16
+    MIN_ALPHA = 50
+    MAX_ALPHA = 150
+
+    def __init__(self, player):
+        super().__init__()
+        self._layer = LAYER_PLAYER
+        self.player = player
+        self.frames = [ASSETS.get("shield", SHIELD_SIZE, COLOR_POWERUP_SHIELD, alpha=self.level_alpha(level)).image
+                       for level in range(self.ALPHA_LEVELS)]
+        self.image = self.frames[0]
+        self.rect = self.image.get_rect(center=player.rect.center)
+
+    @classmethod
+    def level_alpha(cls, level):
+        return cls.MIN_ALPHA + (cls.MAX_ALPHA - cls.MIN_ALPHA) * level // (cls.ALPHA_LEVELS - 1)
+
+    def update(self, dt):
+        # Runs after the player, which shares the layer but was added first
+        alpha = self.player.shield_alpha
+        level = round((alpha - self.MIN_ALPHA) * (self.ALPHA_LEVELS - 1) / (self.MAX_ALPHA - self.MIN_ALPHA))
+        self.image = self.frames[min(max(level, 0), self.ALPHA_LEVELS - 1)]
+        self.rect.center = self.player.rect.center
+
+class SpatialHash:
+    """Uniform-grid broadphase over the playfield.
+
+    Rects are bucketed into named layers every frame with vectorized
+    NumPy ops: each layer is its ids sorted by cell plus per-cell bounds,
+    so sprites and array-backed stores (like EnemyFleet slots) share one
+    grid. Narrow-phase tests only run against entries that share a cell.
+    Rects outside the playfield are clamped into the border cells.
+    """
+    def __init__(self, width=SCREEN_WIDTH, height=SCREEN_HEIGHT, cell_size=100):
+        self.cell_size = cell_size
+        self.cols = math.ceil(width / cell_size)
+        self.rows = math.ceil(height / cell_size)
+        self.layers = {}
+
+    def clear(self):
+        self.layers.clear()
+
+    def cell_range(self, rect):
+        size = self.cell_size
+        x0 = min(max(rect.left // size, 0), self.cols - 1)
+        x1 = min(max((rect.right - 1) // size, 0), self.cols - 1)
+        y0 = min(max(rect.top // size, 0), self.rows - 1)
+        y1 = min(max((rect.bottom - 1) // size, 0), self.rows - 1)
+        return x0, x1, y0, y1
+
+    def insert_rects(self, layer, rects, ids=None, items=None):
+        """Bucket (n, 4) left/top/right/bottom rects; ids default to 0..n-1"""
+        rects = np.asarray(rects, dtype=np.int64).reshape(-1, 4)
+        ids = np.arange(len(rects)) if ids is None else np.asarray(ids)
+        size = self.cell_size
+        x0 = np.clip(rects[:, 0] // size, 0, self.cols - 1)
+        x1 = np.clip((rects[:, 2] - 1) // size, 0, self.cols - 1)
+        y0 = np.clip(rects[:, 1] // size, 0, self.rows - 1)
+        y1 = np.clip((rects[:, 3] - 1) // size, 0, self.rows - 1)
+
+        # One entry per covered cell; rects smaller than a cell cover at most 2x2
+        cells, owners = [], []
+        for dy in range(int((y1 - y0).max(initial=0)) + 1):
+            for dx in range(int((x1 - x0).max(initial=0)) + 1):
+                covered = (x0 + dx <= x1) & (y0 + dy <= y1)
+                cells.append(((y0 + dy) * self.cols + x0 + dx)[covered])
+                owners.append(ids[covered])
+        cells = np.concatenate(cells)
+        owners = np.concatenate(owners)
+
+        order = np.lexsort((owners, cells))
+        bounds = np.searchsorted(cells[order], np.arange(self.cols * self.rows + 1))
+        self.layers[layer] = (owners[order], bounds, items)
+
+    def insert_group(self, layer, group):
+        items = list(group)
+        rects = [(s.rect.left, s.rect.top, s.rect.right, s.rect.bottom) for s in items]
+        self.insert_rects(layer, rects, items=items)
+
+    def query_ids(self, layer, rect):
+        """Sorted ids in layer sharing a cell with rect"""
+        entry = self.layers.get(layer)
+        if entry is None:
+            return np.zeros(0, dtype=np.int64)
+        ids, bounds, _ = entry
+        x0, x1, y0, y1 = self.cell_range(rect)
+        if x0 == x1 and y0 == y1:
+            cell = y0 * self.cols + x0
+            return ids[bounds[cell]:bounds[cell + 1]]
+        parts = [ids[bounds[y * self.cols + x]:bounds[y * self.cols + x + 1]]
+                 for y in range(y0, y1 + 1) for x in range(x0, x1 + 1)]
+        return np.unique(np.concatenate(parts))
+
+    def query(self, layer, rect):
+        """Sprites in layer sharing a cell with rect, in insertion order"""
+        entry = self.layers.get(layer)
+        if entry is None:
+            return []
+        items = entry[2]
+        return [items[i] for i in self.query_ids(layer, rect).tolist()]
+
+    def collide(self, sprite, layer, collided=None, dokill=False):
+        """Grid-accelerated equivalent of pygame.sprite.spritecollide"""
+        hits = []
+        rect = sprite.rect
+        for other in self.query(layer, rect):
+            if not other.alive() or not rect.colliderect(other.rect):
+                continue
+            if collided is None or collided(sprite, other):
+                hits.append(other)
+        if dokill:
+            for other in hits:
+                other.kill()
+        return hits
+
+    def draw(self, surface, font):
+        """Debug overlay: cell grid tinted and labelled by occupancy"""
+        size = self.cell_size
+        counts = np.zeros(self.cols * self.rows, dtype=np.int64)
+        for _, bounds, _ in self.layers.values():
+            counts += np.diff(bounds)
+        for index, count in enumerate(counts.tolist()):
+            rect = pygame.Rect((index % self.cols) * size, (index // self.cols) * size, size, size)
+            if count:
+                heat = min(255, 60 + count * 30)
+                paint(surface, pygame.draw.rect, (heat, 80, 40), rect, 2)
+                label = font.render(str(count), True, (heat, 200, 120))
+                surface.blit(label, (rect.x + 4, rect.y + 2))
             else:
-                self.image.set_alpha(255)
+                paint(surface, pygame.draw.rect, (40, 40, 60), rect, 1)
+
+class Camera:
+    """World-to-screen offset applied when sprites are blitted.
+
+    Screen shake just jitters the offset, so shaking frames draw straight
+    to the display like any other frame.
+    """
+    def __init__(self):
+        self.offset = (0, 0)
+
+    def shake(self, intensity):
+        self.offset = (RNG.shake.randint(-intensity, intensity),
+                       RNG.shake.randint(-intensity, intensity))
+
+    def settle(self):
+        self.offset = (0, 0)
+
+class DirtyRectRenderer:
+    """Opt-in renderer that repaints only what changed since the last frame.
+
+    Each frame it erases last frame's rects to the background, the game
+    draws as usual, and only the union of old and new rects is pushed to
+    the display. Frames with shake or full-screen overlays fall back to a
+    full fill and flip, and the frame after one is full as well so any
+    pixels outside the tracked rects get cleaned up.
+    """
+    def __init__(self, background=COLOR_BG):
+        self.background = background
+        self.previous = None
+        self.forced = True
+
+    def begin(self, surface, force_full=False):
+        self.forced = force_full
+        self.full = force_full or self.previous is None
+        if self.full:
+            surface.fill(self.background)
         else:
-            self.image.set_alpha(255)
-        
-        # Draw shield
-        if self.shield_alpha > 0:
-            shield_surf = pygame.Surface((70, 80), pygame.SRCALPHA)
-            pygame.draw.circle(shield_surf, (*COLOR_POWERUP_SHIELD, int(self.shield_alpha)), 
-                             (35, 40), 35, 3)
-            shield_rect = shield_surf.get_rect(center=(25, 30))
-            self.image.blit(shield_surf, shield_rect.topleft)
+            for rect in self.previous:
+                surface.fill(self.background, rect)
 
-class ComboDisplay:
+    def present(self, rects):
+        if self.full:
+            pygame.display.flip()
+        else:
+            pygame.display.update(self.previous + rects)
+        self.previous = None if self.forced else rects
+
+class DrawList:
+    """One frame's drawing, recorded instead of performed.
+
+    It takes the same blit, blits and fill calls as the screen (and
+    pygame.draw primitives through paint), and replay performs them on a
+    real surface. Everything recorded is either shared cached art or a
+    surface made for this frame, and positions are copied in, so a
+    published list is never changed by the simulation again.
+    """
+    __slots__ = ("ops",)
+
+    def __init__(self):
+        self.ops = []
+
+    def blit(self, source, dest, area=None, special_flags=0):
+        self.ops.append((pygame.Surface.blit, (source, dest, area, special_flags)))
+
+    def blits(self, blit_sequence, doreturn=True):
+        self.ops.append((pygame.Surface.blits, (blit_sequence, False)))
+        return [] if doreturn else None
+
+    def fill(self, color, rect=None, special_flags=0):
+        self.ops.append((pygame.Surface.fill, (color, rect, special_flags)))
+
+    def replay(self, surface):
+        for op, args in self.ops:
+            op(surface, *args)
+
+def paint(surface, primitive, *args):
+    """Call a pygame.draw primitive on surface, or record it when surface is a DrawList"""
+    if isinstance(surface, DrawList):
+        surface.ops.append((primitive, args))
+        return None
+    return primitive(surface, *args)
+
+class FrameBuffer:
+    """Double buffer passing recorded DrawLists from the simulation thread
+    to the main thread.
+
+    submit parks a finished list in back, waiting while the previous one
+    is still there, and take swaps it to front for replay, so simulation
+    runs at most one frame ahead of what is on screen. close wakes the
+    main thread once the simulation is done.
+    """
     def __init__(self):
+        self.ready = threading.Condition()
+        self.front = None
+        self.back = None
+        self.closed = False
+        # Main-thread time spent replaying and flipping the last frame
+        self.replay_ms = 0.0
+        # Simulation-thread time submit spent waiting for the main thread
+        # this frame, cleared by Game.end_frame
+        self.wait_ms = 0.0
+
+    def submit(self, draw_list):
+        start = time.perf_counter()
+        with self.ready:
+            while self.back is not None and not self.closed:
+                self.ready.wait()
+            self.back = draw_list
+            self.ready.notify_all()
+        self.wait_ms += (time.perf_counter() - start) * 1000
+
+    def take(self):
+        """The next frame to show, or None once closed and drained"""
+        with self.ready:
+            while self.back is None and not self.closed:
+                self.ready.wait()
+            self.front, self.back = self.back, None
+            self.ready.notify_all()
+            return self.front
+
+    def close(self):
+        with self.ready:
+            self.closed = True
+            self.ready.notify_all()
+
+class Profiler:
+    """Named timing scopes and per-group counters for every frame.
+
+    Rolling windows feed the on-screen overlay (p50/p95/p99). The full
+    session history, for export as CSV or JSON at the end, is only kept
+    with keep_history since it grows with every frame.
+    """
+    def __init__(self, window=300, keep_history=False):
+        self.window = window
+        self.keep_history = keep_history
+        # Optional AllocationTracer told about every scope
+        self.tracer = None
+        self.reset()
+
+    def reset(self):
+        """Drop every sample, e.g. before reusing a game for another session"""
+        self.recent = {}
+        self.history = {}
+        self.frame_values = {}
+        self.frames = 0
+
+    @contextmanager
+    def scope(self, name):
+        tracer = self.tracer
+        if tracer is not None:
+            tracer.enter(name)
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.add(name, (time.perf_counter() - start) * 1000)
+            if tracer is not None:
+                tracer.exit(name)
+
+    def add(self, name, value):
+        """Accumulate value (ms for scopes) into this frame's sample for name"""
+        self.frame_values[name] = self.frame_values.get(name, 0) + value
+
+    def count(self, name, value):
+        self.frame_values[name] = value
+
+    def end_frame(self):
+        for name, value in self.frame_values.items():
+            recent = self.recent.get(name)
+            if recent is None:
+                recent = self.recent[name] = deque(maxlen=self.window)
+                if self.keep_history:
+                    # Backfill so history columns stay aligned with frames
+                    self.history[name] = array("d", [0.0] * self.frames)
+            recent.append(value)
+            if self.keep_history:
+                self.history[name].append(value)
+        for name, column in self.history.items():
+            if name not in self.frame_values:
+                column.append(0.0)
+        self.frames += 1
+        self.frame_values = {}
+
+    def percentiles(self, name, values=None):
+        values = self.recent[name] if values is None else values
+        return np.percentile(values, (50, 95, 99)) if len(values) else np.zeros(3)
+
+    def summary(self):
+        """Whole-session stats per scope/counter, or the rolling window's
+        without keep_history"""
+        result = {}
+        columns = self.history if self.keep_history else self.recent
+        for name, column in columns.items():
+            values = np.frombuffer(column, dtype=np.float64) if self.keep_history else np.array(column)
+            p50, p95, p99 = self.percentiles(name, values)
+            result[name] = {
+                "mean": float(values.mean()) if len(values) else 0.0,
+                "p50": float(p50),
+                "p95": float(p95),
+                "p99": float(p99),
+                "max": float(values.max()) if len(values) else 0.0,
+            }
+        return result
+
+    def export(self, path):
+        """Write per-frame samples as CSV, or the session summary as JSON, by extension"""
+        names = sorted(self.history)
+        with open(path, "w", newline="") as f:
+            if path.endswith(".json"):
+                json.dump({"frames": self.frames, "scopes": self.summary()}, f, indent=2)
+            else:
+                writer = csv.writer(f)
+                writer.writerow(["frame"] + names)
+                columns = [self.history[name] for name in names]
+                for frame in range(self.frames):
+                    writer.writerow([frame] + [f"{column[frame]:.4f}" for column in columns])
+
+    def draw(self, surface, font):
+        """Overlay of rolling percentiles, timings in ms and counts as-is"""
+        rows = [("scope", "p50", "p95", "p99")]
+        for name in sorted(self.recent):
+            rows.append((name, *(f"{value:.2f}" for value in self.percentiles(name))))
+
+        width = 360
+        columns = (8, 190, 245, 300)
+        panel = pygame.Surface((width, 8 + len(rows) * 18), pygame.SRCALPHA)
+        panel.fill((0, 0, 0, 170))
+        for i, row in enumerate(rows):
+            for x, text in zip(columns, row):
+                panel.blit(font.render(text, True, (180, 255, 180)), (x, 4 + i * 18))
+        surface.blit(panel, (SCREEN_WIDTH - width - 10, 10))
+
+class GcMonitor:
+    """Garbage collector instrumentation for chasing frame spikes.
+
+    Collector pauses are timed through gc.callbacks and reported with the
+    frame they landed in, as gc.pause (ms) and gc.gen0-2 collection counts.
+    In tuned mode automatic collection is off: long-lived objects are
+    frozen after every reset, and the young generations are collected in
+    each frame's idle slack, with full collections only when the slack
+    allows one (or garbage has piled up too far to wait).
+    """
+    def __init__(self, tuned=False, full_slack_ms=6.0, backlog=4):
+        self.tuned = tuned
+        self.full_slack_ms = full_slack_ms
+        self.backlog = backlog
+        self.started = None
+        self.pause_ms = 0.0
+        self.collections = [0, 0, 0]
+        gc.callbacks.append(self.on_gc)
+        if tuned:
+            gc.disable()
+
+    def on_gc(self, phase, info):
+        # Runs inside the collector; only touch plain attributes here
+        if phase == "start":
+            self.started = time.perf_counter()
+        elif self.started is not None:
+            self.pause_ms += (time.perf_counter() - self.started) * 1000
+            self.collections[min(info["generation"], 2)] += 1
+            self.started = None
+
+    def freeze(self):
+        """Move everything alive now out of the collector's reach"""
+        if self.tuned:
+            gc.unfreeze()
+            gc.collect()
+            gc.freeze()
+            # The reset's own collection is not a gameplay pause
+            self.pause_ms = 0.0
+            self.collections = [0, 0, 0]
+
+    def idle(self, slack_ms):
+        """Collect what is due in the time left before the next frame"""
+        if not self.tuned:
+            return
+        threshold = gc.get_threshold()
+        count = gc.get_count()
+        if count[2] >= threshold[2] and (slack_ms >= self.full_slack_ms or count[2] >= threshold[2] * self.backlog):
+            gc.collect(2)
+        elif count[1] >= threshold[1]:
+            gc.collect(1)
+        elif count[0] >= threshold[0]:
+            gc.collect(0)
+
+    def end_frame(self, profiler):
+        profiler.count("gc.pause", self.pause_ms)
+        for generation, collections in enumerate(self.collections):
+            profiler.count(f"gc.gen{generation}", collections)
+        self.pause_ms = 0.0
+        self.collections = [0, 0, 0]
+
+    def close(self):
+        gc.callbacks.remove(self.on_gc)
+        if self.tuned:
+            gc.unfreeze()
+            gc.enable()
+
+class QualityGovernor:
+    """Trades visual detail for frame time through discrete quality tiers.
+
+    The mean work time (excluding the frame-cap sleep) over the last window
+    frames is compared against the budget: above upper * budget the tier
+    drops one step, below lower * budget it rises one. The gap between the
+    two thresholds and a hold of that many frames after every change keep
+    it from flapping between tiers. When not adaptive the tier never moves.
+    """
+    def __init__(self, tier=0, adaptive=True, budget_ms=1000 / FPS, window=30, upper=0.9, lower=0.6,
+                 hold=90, tiers=QUALITY_TIERS):
+        self.tiers = tiers
+        self.level = tier
+        self.adaptive = adaptive
+        self.budget_ms = budget_ms
+        self.upper = upper
+        self.lower = lower
+        self.hold = hold
+        self.samples = deque(maxlen=window)
+        self.since_change = 0
+
+    @property
+    def tier(self):
+        return self.tiers[self.level]
+
+    def record(self, frame_ms):
+        """Feed one frame's work time; returns True when the tier changed"""
+        if not self.adaptive:
+            return False
+        self.samples.append(frame_ms)
+        self.since_change += 1
+        if self.since_change < self.hold or len(self.samples) < self.samples.maxlen:
+            return False
+
+        mean = sum(self.samples) / len(self.samples)
+        if mean > self.budget_ms * self.upper and self.level < len(self.tiers) - 1:
+            self.level += 1
+        elif mean < self.budget_ms * self.lower and self.level > 0:
+            self.level -= 1
+        else:
+            return False
+        self.samples.clear()
+        self.since_change = 0
+        return True
+
+    def end_frame(self, profiler):
+        profiler.count("quality.tier", self.level)
+
+class AllocationTracer:
+    """tracemalloc snapshots around profiler scopes, every Nth frame.
+
+    Each sampled scope contributes the memory it allocated and kept, per
+    source line, plus its transient peak; report() lists the top sites of
+    every phase. Snapshots are slow, so this is strictly a diagnostic mode.
+    Frame 0 is never sampled: its scopes pay for lazy imports and first-use
+    caches rather than steady-state allocations.
+    """
+    def __init__(self, every=60):
+        self.every = every
+        self.frame = 0
+        self.open = {}
+        self.entered = 0
+        self.sites = {}
+        self.peaks = {}
+        tracemalloc.start()
+        self.filters = (tracemalloc.Filter(False, tracemalloc.__file__),
+                        tracemalloc.Filter(False, contextlib.__file__))
+        # Filtering compiles and caches its patterns; do it now, not inside a scope
+        tracemalloc.take_snapshot().filter_traces(self.filters)
+
+        # Skip the tracer's and the profiler's own bookkeeping in reports
+        import inspect
+        self.own_lines = set()
+        for code in (AllocationTracer, Profiler.scope, Profiler.add, Profiler.count):
+            lines, first = inspect.getsourcelines(code)
+            self.own_lines.update(range(first, first + len(lines)))
+
+    def sampling(self):
+        return self.frame > 0 and self.frame % self.every == 0
+
+    def enter(self, name):
+        if self.sampling():
+            self.entered += 1
+            self.open[name] = (tracemalloc.take_snapshot(), tracemalloc.get_traced_memory()[0], self.entered)
+            tracemalloc.reset_peak()
+
+    def exit(self, name):
+        start = self.open.pop(name, None)
+        if start is None:
+            return
+        snapshot, current, entered = start
+        # Nested scopes reset the peak, so only innermost scopes report one
+        if entered == self.entered:
+            peak = tracemalloc.get_traced_memory()[1] - current
+            self.peaks[name] = max(self.peaks.get(name, 0), peak)
+        sites = self.sites.setdefault(name, {})
+        diff = tracemalloc.take_snapshot().filter_traces(self.filters).compare_to(
+            snapshot.filter_traces(self.filters), "lineno")
+        for stat in diff:
+            frame = stat.traceback[0]
+            if stat.size_diff > 0 and not (frame.filename == __file__ and frame.lineno in self.own_lines):
+                site = str(stat.traceback)
+                sites[site] = sites.get(site, 0) + stat.size_diff
+
+    def end_frame(self):
+        self.frame += 1
+
+    def report(self, limit=5):
+        lines = []
+        for name in sorted(self.sites):
+            peak = f", peak {self.peaks[name] / 1024:.1f} KiB" if name in self.peaks else ""
+            lines.append(f"{name}: kept allocations by line{peak}")
+            top = sorted(self.sites[name].items(), key=lambda item: -item[1])[:limit]
+            for site, size in top:
+                lines.append(f"    {size / 1024:8.1f} KiB  {site}")
+        return "\n".join(lines)
+
+    def close(self):
+        tracemalloc.stop()
+
+class TextCache:
+    """Rendered text surfaces keyed by (font, size, text, color), with LRU eviction.
+
+    Fonts are opened lazily, once per (name, size). A 4-tuple color
+    renders the RGB text with the fourth value as surface alpha.
+    """
+    def __init__(self, capacity=256):
+        self.capacity = capacity
+        self.fonts = {}
+        self.surfaces = OrderedDict()
+
+    def font(self, size, name=None):
+        font = self.fonts.get((name, size))
+        if font is None:
+            font = self.fonts[(name, size)] = load_font(name, size)
+        return font
+
+    def render(self, text, size, color, name=None):
+        key = (name, size, text, color)
+        surf = self.surfaces.get(key)
+        if surf is not None:
+            self.surfaces.move_to_end(key)
+            return surf
+
+        surf = self.font(size, name).render(text, True, color[:3])
+        if len(color) == 4:
+            surf.set_alpha(color[3])
+        self.surfaces[key] = surf
+        if len(self.surfaces) > self.capacity:
+            self.surfaces.popitem(last=False)
+        return surf
+
+class HudText:
+    """A HUD label that only re-renders when its text changes"""
+    def __init__(self, cache, size, color, shadow=None):
+        self.cache = cache
+        self.size = size
+        self.color = color
+        self.shadow = shadow
+        self.text = None
+        self.surf = None
+        self.shadow_surf = None
+
+    def draw(self, surface, text, pos):
+        if text != self.text:
+            self.text = text
+            self.surf = self.cache.render(text, self.size, self.color)
+            if self.shadow is not None:
+                self.shadow_surf = self.cache.render(text, self.size, self.shadow)
+        if self.shadow_surf is not None:
+            surface.blit(self.shadow_surf, (pos[0] + 2, pos[1] + 2))
+        surface.blit(self.surf, pos)
+
+class ComboDisplay:
+    # Pre-sized fonts the pop animation steps through (48px up to 1.5x)
+    FONT_SIZES = tuple(range(48, 73, 4))
+
+    def __init__(self, text_cache):
         self.combo = 0
         self.combo_timer = 0
         self.combo_timeout = 1.5
         self.display_scale = 1.0
-        self.font = pygame.font.Font(None, 48)
-        
+        self.text = text_cache
+
     def add_kill(self):
         self.combo += 1
         self.combo_timer = self.combo_timeout
         self.display_scale = 1.5
-        
+
     def update(self, dt):
         if self.combo_timer > 0:
             self.combo_timer -= dt
             if self.combo_timer <= 0:
                 self.combo = 0
-        
+
         if self.display_scale > 1.0:
             self.display_scale -= dt * 2
             self.display_scale = max(1.0, self.display_scale)
-    
+
     def draw(self, screen):
         if self.combo > 1:
-            size = int(48 * self.display_scale)
-            font = pygame.font.Font(None, size)
-            
+            target = 48 * self.display_scale
+            size = min(self.FONT_SIZES, key=lambda s: abs(s - target))
+
             combo_text = f"{self.combo}x COMBO!"
-            text_surf = font.render(combo_text, True, COLOR_COMBO_TEXT)
-            
+            text_surf = self.text.render(combo_text, size, COLOR_COMBO_TEXT)
+
             # Add glow
-            glow_surf = font.render(combo_text, True, (255, 150, 0))
-            glow_surf.set_alpha(100)
-            
+            glow_surf = self.text.render(combo_text, size, (255, 150, 0, 100))
+
             x = SCREEN_WIDTH // 2
             y = 120
-            
+
             for offset in [(-2, -2), (2, -2), (-2, 2), (2, 2)]:
                 screen.blit(glow_surf, (x - text_surf.get_width()//2 + offset[0], 
                                        y + offset[1]))
-            
+
             screen.blit(text_surf, (x - text_surf.get_width()//2, y))
-    
+
     def get_multiplier(self):
-        return 1 + (self.combo - 1) * 0.5 if self.combo > 0 else 1
+        return 1 + (self.combo - 1) * COMBO_MULTIPLIER_STEP if self.combo > 0 else 1
 
 class Game:
-    def __init__(self):
-        pygame.init()
-        self.screen = pygame.display.set_mode((SCREEN_WIDTH, SCREEN_HEIGHT))
+    def __init__(self, headless=False, input_policy=None, seed=None, dirty_rects=False,
+                 star_count=80, swarm=0, collision_precision=CollisionPrecision.PIXEL,
+                 waves=WAVES_PATH, gc_mode=None, trace_allocs=0, asset_pack=ASSET_PACK_PATH,
+                 quality="high", frame_budget_ms=1000 / FPS, pipeline=False, profile_history=False):
+        self.headless = headless
+        self.star_count = star_count
+        # Stress mode: keep at least this many enemies on the field
+        self.swarm = swarm
+        self.collision_precision = CollisionPrecision(collision_precision)
+        if headless:
+            # Offscreen rendering through SDL's dummy video driver
+            os.environ["SDL_VIDEODRIVER"] = "dummy"
+            os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
+        self.input_policy = input_policy or (AutopilotPolicy() if headless else KeyboardPolicy())
+
+        # Only the display is started up front; fonts open on first use and
+        # the game has no audio or joystick input to initialise
+        pygame.display.init()
+        # Draw code targets screen, which is the display itself unless
+        # pipelined, when it is the DrawList being recorded
+        self.display = self.screen = pygame.display.set_mode((SCREEN_WIDTH, SCREEN_HEIGHT))
         pygame.display.set_caption("⚡ NEON ASSAULT ⚡")
         self.clock = pygame.time.Clock()
-        
-        # Fonts
-        self.font_small = pygame.font.Font(None, 28)
-        self.font_medium = pygame.font.Font(None, 40)
-        self.font_large = pygame.font.Font(None, 72)
-        self.font_xlarge = pygame.font.Font(None, 96)
-        
+        # Ticking once starts SDL's timer, which pygame.init() used to
+        self.clock.tick()
+        if asset_pack and ASSETS.pack is None and not ASSETS.entries:
+            ASSETS.load_pack(asset_pack)
+        ASSETS.prewarm()
+
+        # Text rendering, cached per (font, size, string, color)
+        self.text = TextCache()
+        self.hud = {
+            "score": HudText(self.text, 40, (255, 255, 255), shadow=(100, 100, 100)),
+            "high": HudText(self.text, 28, (255, 215, 0)),
+            "kills": HudText(self.text, 28, (255, 100, 100)),
+        }
+        for powerup_type in PowerUpType:
+            self.hud[powerup_type] = HudText(self.text, 28, (255, 255, 255))
+
         self.high_score = 0
-        self.reset_game()
+        self.show_grid = False
+        self.show_profiler = False
+        self.profiler = Profiler(keep_history=profile_history)
+        # Optional GC pause logging / tuned collection, and allocation tracing
+        self.gc = GcMonitor(tuned=gc_mode == "tuned") if gc_mode else None
+        if trace_allocs:
+            self.profiler.tracer = AllocationTracer(trace_allocs)
+        # "auto" lets the governor pick the tier; a tier name pins it
+        names = [tier.name for tier in QUALITY_TIERS]
+        self.quality = QualityGovernor(tier=0 if quality == "auto" else names.index(quality),
+                                       adaptive=quality == "auto", budget_ms=frame_budget_ms)
+        self.camera = Camera()
+        # Pipelined mode simulates on a worker thread while the main thread draws
+        self.pipeline = pipeline
+        self.frames = None
+        self.renderer = DirtyRectRenderer() if dirty_rects and not pipeline else None
+        self.restart_requested = False
+        self.director = WaveDirector.load(waves)
+        self.powerup_pool = SpritePool(
+            lambda powerup_type, groups, x, y: PowerUp(groups, x, y, powerup_type, self.powerup_pool))
+        self.reset_game(seed)
+        self.seed = RNG.seed
+
+    def reset_game(self, seed=None):
+        # Streams carry on across restarts unless a new seed is given
+        if seed is not None or not hasattr(self, 'player'):
+            RNG.reseed(seed)
 
-    def reset_game(self):
         self.running = True
         self.game_active = True
         self.score = 0
@@ -724,63 +2598,290 @@ class Game:
             self.player.invulnerability_timer = 0
             self.player.rect.center = (SCREEN_WIDTH // 2, SCREEN_HEIGHT - 100)
             self.player.velocity = pygame.math.Vector2(0, 0)
-            
+
         self.kills = 0
         self.shake_timer = 0
         self.shake_intensity = 1.0
-        
+
+        # Power-ups still falling go back to their pool before the groups are dropped
+        if hasattr(self, 'powerups'):
+            for powerup in self.powerups.sprites():
+                powerup.kill()
+
         # Groups
         self.all_sprites = pygame.sprite.LayeredUpdates()
-        self.bullets = pygame.sprite.Group()
-        self.enemies = pygame.sprite.Group()
+        self.bullets = BulletPool()
+        self.enemies = EnemyFleet()
         self.powerups = pygame.sprite.Group()
-        
+        self.particles = ParticleSystem()
+        self.grid = SpatialHash()
+        self.sprite_prev = {}
+
         # Stars
-        for _ in range(80):
-            Star(self.all_sprites, LAYER_STAR)
-            
-        self.player = Player(self.all_sprites, self.bullets)
-        
+        self.starfield = Starfield(self.star_count)
+        self.apply_quality()
+
+        self.player = Player(self.all_sprites, self.bullets, self.particles, self, self.input_policy)
+
         # Spawning
-        self.enemy_timer = 0
-        self.enemy_spawn_rate = 0.8
         self.powerup_timer = 0
         self.powerup_spawn_rate = 15.0
-        
+
+        # Pools: enough power-ups of each type to cover every one that can
+        # be falling at once
+        pool = self.powerup_pool
+        pool.hits = pool.misses = 0
+        # Seconds a power-up takes to fall off the screen at 150 px/s
+        fall_time = (SCREEN_HEIGHT + 60) / 150
+        for powerup_type in PowerUpType:
+            pool.prewarm(powerup_type, math.ceil(fall_time / self.powerup_spawn_rate) + 1, 0, -30)
+
         # Combo system
-        self.combo = ComboDisplay()
-        
+        self.combo = ComboDisplay(self.text)
+
         # Wave system
-        self.wave = 1
+        self.director.reset()
+        self.wave = self.director.wave
         self.wave_timer = 0
-        self.wave_announce_timer = 0
+        self.wave_announce_timer = WAVE_ANNOUNCE_TIME
+        self.prewarm_wave(self.director.heap)
+        self.prewarm_wave(self.director.upcoming[3])
+        self.enemies.reserve(self.swarm)
+
+        # Everything built above lives for the whole session
+        if self.gc is not None:
+            self.gc.freeze()
 
     def run(self):
+        if self.pipeline:
+            self.run_pipelined(self.play_window, pace=True)
+        else:
+            self.play_window()
+        self.input_policy.close()
+        self.close_monitors()
+        pygame.quit()
+
+    def play_window(self):
+        """Window loop: fixed SIM_DT steps for the time each frame took, then
+        one draw interpolated between the last two steps"""
+        backlog = 0.0
+        last = time.perf_counter()
         while self.running:
-            dt = self.clock.tick(FPS) / 1000.0
-            
-            self.handle_events()
-            if self.game_active:
+            if self.pipeline:
+                # Paced by the main thread's replay loop, which also handles events
+                now = time.perf_counter()
+                frame_dt, last = now - last, now
+            else:
+                frame_dt = self.clock.tick(FPS) / 1000.0
+                self.handle_events()
+            backlog = min(backlog + frame_dt, SIM_DT * MAX_CATCH_UP_STEPS)
+            frame_start = time.perf_counter()
+
+            steps = 0
+            while backlog >= SIM_DT and self.running:
+                self.tick(SIM_DT)
+                backlog -= SIM_DT
+                steps += 1
+            self.profiler.count("sim.steps", steps)
+            # Nothing moves between steps once the game is over
+            self.draw(min(backlog / SIM_DT, 1.0) if self.game_active else 1.0)
+            if self.quality.record(self.work_ms(frame_start)):
+                self.apply_quality()
+            self.end_frame()
+            self.idle(frame_start)
+
+    def run_pipelined(self, play, pace=False):
+        """Run play() on a simulation thread while this thread shows its frames.
+
+        SDL wants window, event and display calls on the thread that opened
+        the window, so the main thread keeps all of them: it pumps events,
+        replays every DrawList the simulation publishes and flips. The
+        simulation thread owns every game object, cache and font, runs
+        tick and records frames, and makes no window or event calls. pace
+        caps the main loop at FPS.
+        """
+        self.frames = FrameBuffer()
+        failure = []
+
+        def simulate():
+            try:
+                play()
+            except BaseException as e:
+                failure.append(e)
+            finally:
+                self.frames.close()
+
+        worker = threading.Thread(target=simulate, name="simulation", daemon=True)
+        worker.start()
+        while True:
+            if pace:
+                self.clock.tick(FPS)
+            if self.headless:
+                pygame.event.pump()
+            else:
+                self.handle_events()
+            draw_list = self.frames.take()
+            if draw_list is None:
+                break
+            start = time.perf_counter()
+            draw_list.replay(self.display)
+            pygame.display.flip()
+            self.frames.replay_ms = (time.perf_counter() - start) * 1000
+        worker.join()
+        self.frames = None
+        if failure:
+            raise failure[0]
+
+    def work_ms(self, frame_start):
+        """This frame's work time for the quality governor.
+
+        Pipelined, the time submit spent waiting for the paced main thread
+        is not work, and the main thread's replay runs alongside, so the
+        frame costs whichever thread is busier.
+        """
+        work_ms = (time.perf_counter() - frame_start) * 1000
+        if self.frames is None:
+            return work_ms
+        return max(work_ms - self.frames.wait_ms, self.frames.replay_ms)
+
+    def idle(self, frame_start):
+        """Hand the rest of this frame's budget to deferred GC work"""
+        if self.gc is not None:
+            self.gc.idle(1000 / FPS - (time.perf_counter() - frame_start) * 1000)
+
+    def apply_quality(self):
+        """Push the governor's current tier into the effect systems"""
+        tier = self.quality.tier
+        self.particles.emission = tier.particles
+        self.particles.glow = tier.glow
+        self.bullets.trail_segments = tier.bullet_trail
+
+    def close_monitors(self):
+        if self.gc is not None:
+            self.gc.close()
+        tracer = self.profiler.tracer
+        if tracer is not None:
+            print(tracer.report())
+            tracer.close()
+
+    def end_frame(self):
+        """Record this frame's sprite counts and close out the profiler sample"""
+        profiler = self.profiler
+        profiler.count("count.sprites", len(self.all_sprites))
+        profiler.count("count.stars", len(self.starfield))
+        profiler.count("count.enemies", len(self.enemies))
+        profiler.count("count.bullets", len(self.bullets))
+        profiler.count("count.powerups", len(self.powerups))
+        profiler.count("count.particles", len(self.particles))
+        profiler.count("pool.enemies.hits", self.enemies.hits)
+        profiler.count("pool.enemies.misses", self.enemies.misses)
+        profiler.count("pool.powerups.hits", self.powerup_pool.hits)
+        profiler.count("pool.powerups.misses", self.powerup_pool.misses)
+        self.quality.end_frame(profiler)
+        if self.frames is not None:
+            profiler.count("render.replay", self.frames.replay_ms)
+            profiler.count("render.wait", self.frames.wait_ms)
+            self.frames.wait_ms = 0.0
+        if self.gc is not None:
+            self.gc.end_frame(profiler)
+        if profiler.tracer is not None:
+            profiler.tracer.end_frame()
+        profiler.end_frame()
+
+    def tick(self, dt):
+        """Advance one frame through the input policy, which may record or replay it.
+
+        Returns the dt actually simulated, or None once a replay runs out.
+        """
+        dt, restart = self.input_policy.begin_frame(dt, self.restart_requested)
+        self.restart_requested = False
+        if dt is None:
+            self.running = False
+            return None
+
+        if restart and not self.game_active:
+            self.reset_game()
+        if self.game_active:
+            with self.profiler.scope("update"):
                 self.update(dt)
-            self.draw()
-            
+        self.input_policy.end_frame()
+        return dt
+
+    def run_headless(self, frames, dt=SIM_DT, draw_every=0, stop_on_game_over=True):
+        """Advance the simulation with a fixed dt as fast as the CPU allows.
+
+        draw_every renders one frame in every N (0 skips drawing entirely).
+        Returns a report of the session, including simulated frames per
+        wall-clock second.
+        """
+        frame_times = []
+        peak_sprites = 0
+        sim_seconds = 0.0
+        frame = 0
+
+        def play():
+            nonlocal peak_sprites, sim_seconds, frame
+            while frame < frames and self.running:
+                if not self.game_active and stop_on_game_over:
+                    break
+                frame_start = time.perf_counter()
+                if not self.pipeline:
+                    pygame.event.pump()
+                step = self.tick(dt)
+                if step is None:
+                    break
+                sim_seconds += step
+                frame += 1
+                if draw_every and frame % draw_every == 0:
+                    self.draw()
+                if self.quality.record(self.work_ms(frame_start)):
+                    self.apply_quality()
+                self.end_frame()
+                frame_times.append(time.perf_counter() - frame_start)
+                self.idle(frame_start)
+                peak_sprites = max(peak_sprites, len(self.all_sprites) + len(self.enemies) + len(self.bullets) + len(self.particles))
+
+        start = time.perf_counter()
+        if self.pipeline:
+            # Elapsed time includes the main thread showing the last frame
+            self.run_pipelined(play)
+        else:
+            play()
+        elapsed = time.perf_counter() - start
+
+        p50, p95, p99 = np.percentile(frame_times, (50, 95, 99)) * 1000 if frame_times else (0, 0, 0)
+        return {
+            "frames": frame,
+            "sim_seconds": sim_seconds,
+            "wall_seconds": elapsed,
+            "sim_fps": frame / elapsed if elapsed > 0 else float("inf"),
+            "score": self.score,
+            "kills": self.kills,
+            "wave": self.wave,
+            "peak_sprites": peak_sprites,
+            "frame_ms_p50": float(p50),
+            "frame_ms_p95": float(p95),
+            "frame_ms_p99": float(p99),
+            "game_over": not self.game_active,
+        }
+
     def draw_health(self):
         """Draw player health bar or hearts"""
         if not self.game_active: return
-        
+
         # Draw Hearts
         for i in range(self.player.max_health):
             x = 20 + i * 35
             y = SCREEN_HEIGHT - 40
-            
+
             color = (255, 50, 50) if i < self.player.health else (50, 20, 20)
-            
+
             # Draw Heart Shape
             surf = pygame.Surface((30, 30), pygame.SRCALPHA)
             pygame.draw.circle(surf, color, (10, 10), 10)
             pygame.draw.circle(surf, color, (20, 10), 10)
             pygame.draw.polygon(surf, color, [(0, 15), (30, 15), (15, 30)])
-            
+
             self.screen.blit(surf, (x, y))
 
     def draw(self):
@@ -797,7 +2898,7 @@ class Game:
         # OR I can insert draw_health before draw and then I need to modify draw.
         # Let's read the rest of the file first.
         pass
-            
+
         pygame.quit()
         sys.exit()
 
@@ -805,98 +2906,143 @@ class Game:
         for event in pygame.event.get():
             if event.type == pygame.QUIT:
                 self.running = False
-            
+
+            if event.type == pygame.KEYDOWN and event.key == pygame.K_F2:
+                self.show_profiler = not self.show_profiler
+
+            if event.type == pygame.KEYDOWN and event.key == pygame.K_F3:
+                self.show_grid = not self.show_grid
+
             if not self.game_active:
                 if event.type == pygame.KEYDOWN and event.key == pygame.K_r:
-                    self.reset_game()
+                    self.restart_requested = True
+        self.input_policy.sample()
 
     def update(self, dt):
+        profiler = self.profiler
+        # Where each sprite started this step, for interpolated drawing
+        self.sprite_prev = {sprite: sprite.rect.topleft for sprite in self.all_sprites}
         try:
-            self.spawn_enemies(dt)
-            self.spawn_powerups(dt)
-            self.all_sprites.update(dt)
+            with profiler.scope("update.spawn"):
+                self.spawn_enemies(dt)
+                self.spawn_powerups(dt)
+            with profiler.scope("update.stars"):
+                self.starfield.update(dt)
+            with profiler.scope("update.bullets"):
+                # Before the player shoots, so new bullets start at the muzzle
+                self.bullets.update(dt)
+            with profiler.scope("update.sprites"):
+                self.all_sprites.update(dt)
+            with profiler.scope("update.enemies"):
+                self.enemies.update(dt)
+            with profiler.scope("update.particles"):
+                self.particles.update(dt)
             self.combo.update(dt)
-            
+
             # Screen shake decay
             if self.shake_timer > 0:
                 self.shake_timer -= dt
-            
-            # Enemy trails
-            for enemy in list(self.enemies):
-                if random.random() < 0.3:
-                    TrailParticle(self.all_sprites, enemy.rect.centerx, enemy.rect.centery,
-                                (255, 0, 255), size=3)
-            
-            # Bullet-Enemy collision
-            hits = pygame.sprite.groupcollide(self.enemies, self.bullets, False, True, 
-                                             pygame.sprite.collide_mask)
-            for enemy, bullet_list in hits.items():
-                try:
-                    if enemy.take_damage():
-                        # Store enemy data before killing
-                        enemy_type = enemy.enemy_type
-                        enemy_x = enemy.rect.centerx
-                        enemy_y = enemy.rect.centery
-                        enemy.kill()
-                        self.on_enemy_killed_with_data(enemy_type, enemy_x, enemy_y)
-                except Exception as e:
-                    print(f"Error in bullet collision: {e}")
-                    continue
-            
-            # Player-PowerUp collision
-            powerup_hits = pygame.sprite.spritecollide(self.player, self.powerups, True)
-            for powerup in powerup_hits:
-                try:
-                    self.player.activate_powerup(powerup.powerup_type)
-                    self.trigger_shake(0.15, 0.5)
-                    
-                    # Celebration particles
-                    for _ in range(20):
-                        Particle(self.all_sprites, powerup.rect.centerx, powerup.rect.centery,
-                                powerup.config.color, size_range=(3, 7), speed_range=(100, 300))
-                except Exception as e:
-                    print(f"Error in powerup collision: {e}")
-                    continue
-            
-            # Player-Enemy collision
-            if not self.player.has_shield:
-                enemy_hits = pygame.sprite.spritecollide(self.player, self.enemies, False, 
-                                                         pygame.sprite.collide_mask)
-                for enemy in enemy_hits:
-                    if self.player.take_damage():
-                        self.game_over()
-                    else:
-                        # Player got hurt but survived
-                        self.trigger_shake(0.4, 2.0)
-                        enemy.kill() # Destroy enemy that hit us
-                        
-                        # Hurt particles
-                        for _ in range(15):
-                            Particle(self.all_sprites, self.player.rect.centerx, self.player.rect.centery,
-                                   (255, 50, 50), size_range=(3, 6), speed_range=(100, 200))
-            else:
-                # Shield deflects enemies
-                enemy_hits = pygame.sprite.spritecollide(self.player, self.enemies, True, 
-                                                         pygame.sprite.collide_mask)
-                for enemy in enemy_hits:
-                    try:
-                        self.trigger_shake(0.3, 1.5)
-                        for _ in range(25):
-                            Particle(self.all_sprites, enemy.rect.centerx, enemy.rect.centery,
-                                   COLOR_POWERUP_SHIELD, size_range=(4, 8), speed_range=(150, 350))
-                    except Exception as e:
-                        print(f"Error in shield collision: {e}")
-                        continue
+            if self.wave_announce_timer > 0:
+                self.wave_announce_timer -= dt
+
+            with profiler.scope("update.trails"):
+                self.spawn_trails(dt)
+            with profiler.scope("update.collisions"):
+                self.handle_collisions()
         except Exception as e:
             print(f"Error in update: {e}")
             import traceback
             traceback.print_exc()
 
+    def spawn_trails(self, dt):
+        # Enemy trails, at a 30% chance per enemy per 60 Hz frame at full quality
+        chance = 0.3 * self.quality.tier.trails * dt * FPS
+        if chance <= 0:
+            return
+        idx = self.enemies.active()
+        idx = idx[RNG.effects.random(len(idx)) < chance]
+        self.particles.trail(self.enemies.cx[idx], self.enemies.cy[idx], (255, 0, 255), size=3)
+
+    def handle_collisions(self):
+        fleet = self.enemies
+        active = fleet.active()
+        precision = self.collision_precision
+
+        # Broadphase
+        self.grid.clear()
+        self.grid.insert_rects("enemies", fleet.bounds(active), ids=active)
+        self.grid.insert_group("powerups", self.powerups)
+
+        # Bullet-Enemy collision: each bullet hits the first enemy it overlaps
+        hits = {}
+        bullets = self.bullets
+        for b in bullets.active().tolist():
+            rect = bullets.rect(b)
+            for i in self.grid.query_ids("enemies", rect).tolist():
+                if fleet.overlaps(i, rect, bullets.hitboxes[bullets.kind[b]], precision):
+                    hits.setdefault(i, []).append(b)
+                    bullets.kill(b)
+                    break
+        for i in hits:
+            try:
+                if fleet.take_damage(i):
+                    # Store enemy data before killing
+                    enemy_type = fleet.enemy_type(i)
+                    enemy_x = int(fleet.cx[i])
+                    enemy_y = int(fleet.cy[i])
+                    fleet.kill(i)
+                    self.on_enemy_killed_with_data(enemy_type, enemy_x, enemy_y)
+            except Exception as e:
+                print(f"Error in bullet collision: {e}")
+                continue
+
+        # Player-PowerUp collision
+        powerup_hits = self.grid.collide(self.player, "powerups", dokill=True)
+        for powerup in powerup_hits:
+            try:
+                self.player.activate_powerup(powerup.powerup_type)
+                self.trigger_shake(0.15, 0.5)
+
+                # Celebration particles
+                self.particles.emit(powerup.rect.centerx, powerup.rect.centery,
+                                    powerup.config.color, 20, size_range=(3, 7), speed_range=(100, 300))
+            except Exception as e:
+                print(f"Error in powerup collision: {e}")
+                continue
+
+        # Player-Enemy collision
+        player = self.player
+        enemy_hits = [i for i in self.grid.query_ids("enemies", player.rect).tolist()
+                      if fleet.alive[i] and fleet.overlaps(i, player.rect, player.hitbox, precision)]
+        if not player.has_shield:
+            for i in enemy_hits:
+                if player.take_damage():
+                    self.game_over()
+                else:
+                    # Player got hurt but survived
+                    self.trigger_shake(0.4, 2.0)
+                    fleet.kill(i) # Destroy enemy that hit us
+
+                    # Hurt particles
+                    self.particles.emit(player.rect.centerx, player.rect.centery,
+                                        (255, 50, 50), 15, size_range=(3, 6), speed_range=(100, 200))
+        else:
+            # Shield deflects enemies
+            for i in enemy_hits:
+                try:
+                    fleet.kill(i)
+                    self.trigger_shake(0.3, 1.5)
+                    self.particles.emit(int(fleet.cx[i]), int(fleet.cy[i]),
+                                        COLOR_POWERUP_SHIELD, 25, size_range=(4, 8), speed_range=(150, 350))
+                except Exception as e:
+                    print(f"Error in shield collision: {e}")
+                    continue
+
     def on_enemy_killed_with_data(self, enemy_type, x, y):
         """Handle enemy death"""
         self.kills += 1
         self.combo.add_kill()
-        
+
         # Score with combo multiplier - bosses worth more
         if enemy_type == "boss":
             base_score = 500
@@ -906,14 +3052,14 @@ class Game:
             base_score = 150
         else:
             base_score = 100
-            
+
         self.score += int(base_score * self.combo.get_multiplier())
-        
+
         # More intense shake for bosses
         shake_duration = 0.5 if enemy_type == "boss" else 0.25
         shake_intensity = 2.0 if enemy_type == "boss" else 1.0
         self.trigger_shake(shake_duration, shake_intensity)
-        
+
         # Explosion particles - more for bosses
         if enemy_type == "boss":
             color = (200, 0, 150)
@@ -927,46 +3073,40 @@ class Game:
         else:
             color = (255, 0, 255)
             particle_count = 20
-        
-        for _ in range(particle_count):
-            Particle(self.all_sprites, x, y,
-                    color, size_range=(3, 8), speed_range=(100, 400), life_range=(0.4, 1.0))
+
+        self.particles.emit(x, y, color, particle_count,
+                            size_range=(3, 8), speed_range=(100, 400), life_range=(0.4, 1.0))
 
     def spawn_enemies(self, dt):
-        self.enemy_timer += dt
-        if self.enemy_timer >= self.enemy_spawn_rate:
-            self.enemy_timer = 0
-            
-            # Difficulty scaling
-            speed_mod = (self.score // 1000) * 40
-            
-            # Enemy type distribution
-            roll = random.random()
-            if roll < 0.65:  # 65% normal enemies
-                enemy_type = "normal"
-            elif roll < 0.85:  # 20% fast enemies
-                enemy_type = "fast"
-            elif roll < 0.97:  # 12% tank enemies
-                enemy_type = "tank"
-            else:  # 3% boss enemies
-                enemy_type = "boss"
-            
-            enemy = Enemy(self.all_sprites, speed_modifier=speed_mod, enemy_type=enemy_type)
-            self.enemies.add(enemy)
-            
-            # Progressive spawn rate increase (caps at 0.25s)
-            target_rate = max(0.25, 0.8 - (self.score / 8000.0))
-            self.enemy_spawn_rate = target_rate
+        director = self.director
+        for enemy_type, speed_mod in director.advance(dt):
+            self.enemies.spawn(enemy_type, speed_modifier=speed_mod)
+
+        if director.wave != self.wave:
+            self.wave = director.wave
+            self.wave_announce_timer = WAVE_ANNOUNCE_TIME
+            self.prewarm_wave(director.upcoming[3])
+        self.wave_timer = director.clock - director.wave_start
+
+        # Swarm mode: top the fleet up, staggered above the screen
+        for _ in range(self.swarm - len(self.enemies)):
+            enemy_type = roll_enemy_type(RNG.spawns)
+            self.enemies.spawn(enemy_type, y=RNG.spawns.uniform(-SCREEN_HEIGHT, -30))
+
+    def prewarm_wave(self, events):
+        """Reserve fleet slots and build art for a wave's spawn events before they are due"""
+        self.enemies.reserve(len(self.enemies) + len(events))
+        for enemy_type in {event[2] for event in events}:
+            ASSETS.enemy(enemy_type).hitbox
 
     def spawn_powerups(self, dt):
         self.powerup_timer += dt
         if self.powerup_timer >= self.powerup_spawn_rate:
             self.powerup_timer = 0
-            
-            powerup_type = random.choice(list(PowerUpType))
-            x = random.randint(60, SCREEN_WIDTH - 60)
-            powerup = PowerUp(self.all_sprites, x, -30, powerup_type)
-            self.powerups.add(powerup)
+
+            powerup_type = RNG.spawns.choice(list(PowerUpType))
+            x = RNG.spawns.randint(60, SCREEN_WIDTH - 60)
+            self.powerup_pool.acquire(powerup_type, (self.all_sprites, self.powerups), x, -30)
 
     def trigger_shake(self, duration, intensity=1.0):
         self.shake_timer = max(self.shake_timer, duration)
@@ -976,142 +3116,172 @@ class Game:
         self.game_active = False
         if self.score > self.high_score:
             self.high_score = self.score
-        
+
         # Death explosion
-        for _ in range(50):
-            Particle(self.all_sprites, self.player.rect.centerx, self.player.rect.centery,
-                    (0, 255, 255), size_range=(4, 12), speed_range=(100, 500), life_range=(0.5, 1.5))
+        self.particles.emit(self.player.rect.centerx, self.player.rect.centery,
+                            (0, 255, 255), 50, size_range=(4, 12), speed_range=(100, 500), life_range=(0.5, 1.5))
 
-    def draw(self):
+    def draw(self, alpha=1.0):
+        """Render the current state, alpha of the way from the previous step to the last.
+
+        In pipelined mode the frame is recorded into a fresh DrawList and
+        handed to the main thread instead of being drawn here.
+        """
+        profiler = self.profiler
+        if self.pipeline:
+            self.screen = DrawList()
         try:
             # Screen shake
-            offset_x, offset_y = 0, 0
             if self.shake_timer > 0:
-                intensity = int(8 * self.shake_intensity)
-                offset_x = random.randint(-intensity, intensity)
-                offset_y = random.randint(-intensity, intensity)
-                
-            self.screen.fill(COLOR_BG)
-            
-            # Draw with shake
-            if self.shake_timer > 0:
-                shake_surf = pygame.Surface((SCREEN_WIDTH, SCREEN_HEIGHT))
-                shake_surf.fill(COLOR_BG)
-                self.all_sprites.draw(shake_surf)
-                
-                # Draw HP bars for bosses on shake surface
-                for enemy in list(self.enemies):  # Use list() to avoid iteration issues
-                    try:
-                        if hasattr(enemy, 'enemy_type') and enemy.enemy_type == "boss":
-                            enemy.draw_hp_bar(shake_surf)
-                    except:
-                        pass  # Skip if enemy is being removed
-                
-                self.screen.blit(shake_surf, (offset_x, offset_y))
+                self.camera.shake(int(8 * self.shake_intensity))
             else:
-                self.all_sprites.draw(self.screen)
-                
-                # Draw HP bars for bosses
-                for enemy in list(self.enemies):  # Use list() to avoid iteration issues
-                    try:
-                        if hasattr(enemy, 'enemy_type') and enemy.enemy_type == "boss":
-                            enemy.draw_hp_bar(self.screen)
-                    except:
-                        pass  # Skip if enemy is being removed
+                self.camera.settle()
+
+            renderer = self.renderer
+            dirty = None
+            if renderer is not None:
+                overlays = self.show_grid or self.show_profiler or not self.game_active
+                renderer.begin(self.screen, force_full=self.shake_timer > 0 or overlays)
+                dirty = list(HUD_REGIONS)
+
+            with profiler.scope("draw.world"):
+                if renderer is None:
+                    self.screen.fill(COLOR_BG)
+                self.draw_world(self.screen, dirty, alpha)
+
+            if self.show_grid:
+                self.grid.draw(self.screen, self.text.font(28))
 
             # UI
-            self.draw_ui()
-            
-            if not self.game_active:
-                self.draw_game_over()
-                
-            pygame.display.flip()
+            with profiler.scope("draw.ui"):
+                self.draw_ui()
+
+                if not self.game_active:
+                    self.draw_game_over()
+
+            if self.show_profiler:
+                self.profiler.draw(self.screen, self.text.font(20))
+
+            with profiler.scope("draw.flip"):
+                if self.pipeline:
+                    self.submit_frame()
+                elif renderer is not None:
+                    renderer.present(dirty)
+                else:
+                    pygame.display.flip()
         except Exception as e:
             print(f"Error in draw: {e}")
             import traceback
             traceback.print_exc()
             # Try to continue anyway
+            if self.pipeline:
+                self.submit_frame()
+            else:
+                pygame.display.flip()
+
+    def submit_frame(self):
+        """Hand the recorded frame to the main thread, or show it right away
+        when draw is called outside run_pipelined"""
+        if self.frames is not None:
+            self.frames.submit(self.screen)
+        else:
+            self.screen.replay(self.display)
             pygame.display.flip()
 
+    def draw_world(self, surface, dirty=None, alpha=1.0):
+        """Draw sprites in layer order, with the array-backed enemy fleet,
+        bullet pool and particle system slotted in at their layers.
+
+        Everything goes through the camera offset at blit time, so screen
+        shake costs nothing extra. When dirty is a list, the screen rect of
+        every blit is appended to it. alpha below 1 draws every entity that
+        far between its positions before and after the last step.
+        """
+        ox, oy = self.camera.offset
+        collect = dirty is not None
+        self.starfield.draw(surface, self.camera.offset, dirty, alpha)
+        batches = {LAYER_ENEMY: self.enemies, LAYER_BULLET: self.bullets, LAYER_PARTICLE: self.particles}
+        for layer in sorted(set(self.all_sprites.layers()) | set(batches)):
+            if layer in batches:
+                batches[layer].draw(surface, self.camera.offset, dirty, alpha)
+            rects = surface.blits([(sprite.image, self.sprite_position(sprite, alpha, ox, oy))
+                                   for sprite in self.all_sprites.get_sprites_from_layer(layer)], collect)
+            if collect:
+                dirty.extend(rects)
+
+    def sprite_position(self, sprite, alpha, ox=0, oy=0):
+        """Screen topleft of a sprite, interpolated from where it started the last step"""
+        x, y = sprite.rect.topleft
+        prev = self.sprite_prev.get(sprite)
+        if alpha < 1.0 and prev is not None and abs(x - prev[0]) <= INTERP_SNAP and abs(y - prev[1]) <= INTERP_SNAP:
+            x = prev[0] + (x - prev[0]) * alpha
+            y = prev[1] + (y - prev[1]) * alpha
+        return int(x) + ox, int(y) + oy
+
     def draw_ui(self):
         """Draw game UI"""
+        hud = self.hud
+
         # Score
-        score_text = f"SCORE: {self.score:,}"
-        score_surf = self.font_medium.render(score_text, True, (255, 255, 255))
-        score_surf_shadow = self.font_medium.render(score_text, True, (100, 100, 100))
-        self.screen.blit(score_surf_shadow, (12, 12))
-        self.screen.blit(score_surf, (10, 10))
-        
+        hud["score"].draw(self.screen, f"SCORE: {self.score:,}", (10, 10))
+
         # High Score
-        high_text = f"HIGH: {self.high_score:,}"
-        high_surf = self.font_small.render(high_text, True, (255, 215, 0))
-        self.screen.blit(high_surf, (10, 55))
-        
+        hud["high"].draw(self.screen, f"HIGH: {self.high_score:,}", (10, 55))
+
         # Kills
-        kills_text = f"KILLS: {self.kills}"
-        kills_surf = self.font_small.render(kills_text, True, (255, 100, 100))
-        self.screen.blit(kills_surf, (10, 85))
-        
+        hud["kills"].draw(self.screen, f"KILLS: {self.kills}", (10, 85))
+
         # Combo
         self.combo.draw(self.screen)
-        
+
+        # Wave banner, fading out in stepped alpha
+        if self.wave_announce_timer > 0:
+            alpha = min(255, int(self.wave_announce_timer / WAVE_ANNOUNCE_TIME * 2 * 255) // 32 * 32)
+            title = self.text.render(f"WAVE {self.wave}", 64, (0, 255, 255, alpha))
+            name = self.text.render(self.director.wave_name.upper(), 32, (255, 0, 255, alpha))
+            self.screen.blit(title, title.get_rect(center=(SCREEN_WIDTH // 2, 235)))
+            self.screen.blit(name, name.get_rect(center=(SCREEN_WIDTH // 2, 280)))
+
         # Power-up indicators
         y_offset = SCREEN_HEIGHT - 60
         for i, (powerup_type, time_left) in enumerate(self.player.active_powerups.items()):
             config = POWERUP_CONFIGS[powerup_type]
-            
+
             # Background bar
             bar_width = 150
             bar_height = 20
             x = SCREEN_WIDTH - bar_width - 20
             y = y_offset - i * 35
-            
-            pygame.draw.rect(self.screen, (50, 50, 50), (x, y, bar_width, bar_height))
-            
+
+            paint(self.screen, pygame.draw.rect, (50, 50, 50), (x, y, bar_width, bar_height))
+
             # Progress bar
             progress = time_left / config.duration
-            pygame.draw.rect(self.screen, config.color, 
-                           (x, y, int(bar_width * progress), bar_height))
-            
+            paint(self.screen, pygame.draw.rect, config.color,
+                  (x, y, int(bar_width * progress), bar_height))
+
             # Label
-            label = f"{config.symbol} {time_left:.1f}s"
-            label_surf = self.font_small.render(label, True, (255, 255, 255))
-            self.screen.blit(label_surf, (x + 5, y - 2))
+            hud[powerup_type].draw(self.screen, f"{config.symbol} {time_left:.1f}s", (x + 5, y - 2))
 
         # Draw Health Hearts
         if hasattr(self.player, 'max_health'):
+            heart_size = 30
             for i in range(self.player.max_health):
                 x = 20 + i * 35
                 y = SCREEN_HEIGHT - 40
-                
+
                 # Active vs Empty
                 if i < self.player.health:
-                    color = (255, 50, 50) 
-                    glow = True
-                else:
-                    color = (80, 20, 20)
-                    glow = False
-                
-                # Draw Heart Shape
-                heart_size = 30
-                surf = pygame.Surface((heart_size, heart_size), pygame.SRCALPHA)
-                
-                # Points for heart
-                pygame.draw.circle(surf, color, (9, 9), 9)
-                pygame.draw.circle(surf, color, (21, 9), 9)
-                pygame.draw.polygon(surf, color, [(0, 14), (30, 14), (15, 30)])
-                
-                if glow:
-                    # Subtle pulse
+                    # Subtle pulse, stepped through cached sizes
                     scale = 1.0 + 0.1 * math.sin(pygame.time.get_ticks() / 300 + i)
                     new_size = int(heart_size * scale)
-                    surf = pygame.transform.scale(surf, (new_size, new_size))
-                    
+                    surf = ASSETS.get("heart", new_size, (255, 50, 50)).image
+
                     # Centering offset
                     offset = (heart_size - new_size) // 2
                     self.screen.blit(surf, (x + offset, y + offset))
                 else:
-                    self.screen.blit(surf, (x, y))
+                    self.screen.blit(ASSETS.get("heart", heart_size, (80, 20, 20)).image, (x, y))
 
     def draw_game_over(self):
         """Draw game over screen"""
@@ -1119,38 +3289,37 @@ class Game:
         overlay = pygame.Surface((SCREEN_WIDTH, SCREEN_HEIGHT), pygame.SRCALPHA)
         overlay.fill((0, 0, 0, 200))
         self.screen.blit(overlay, (0, 0))
-        
+
         # GAME OVER with glow
         go_text = "GAME OVER"
-        go_surf_glow = self.font_xlarge.render(go_text, True, (255, 50, 50))
-        go_surf_glow.set_alpha(100)
-        go_surf = self.font_xlarge.render(go_text, True, (255, 100, 100))
-        
+        go_surf_glow = self.text.render(go_text, 96, (255, 50, 50, 100))
+        go_surf = self.text.render(go_text, 96, (255, 100, 100))
+
         go_rect = go_surf.get_rect(center=(SCREEN_WIDTH//2, SCREEN_HEIGHT//2 - 80))
-        
+
         # Glow effect
         for dx, dy in [(-3, -3), (3, -3), (-3, 3), (3, 3)]:
             self.screen.blit(go_surf_glow, (go_rect.x + dx, go_rect.y + dy))
         self.screen.blit(go_surf, go_rect)
-        
+
         # Final score
         final_text = f"Final Score: {self.score:,}"
-        final_surf = self.font_large.render(final_text, True, (255, 255, 255))
+        final_surf = self.text.render(final_text, 72, (255, 255, 255))
         final_rect = final_surf.get_rect(center=(SCREEN_WIDTH//2, SCREEN_HEIGHT//2))
         self.screen.blit(final_surf, final_rect)
-        
+
         # Kills
         kills_text = f"Enemies Destroyed: {self.kills}"
-        kills_surf = self.font_medium.render(kills_text, True, (255, 200, 200))
+        kills_surf = self.text.render(kills_text, 40, (255, 200, 200))
         kills_rect = kills_surf.get_rect(center=(SCREEN_WIDTH//2, SCREEN_HEIGHT//2 + 60))
         self.screen.blit(kills_surf, kills_rect)
-        
+
         # High score notification
         if self.score == self.high_score and self.score > 0:
             new_high_text = "★ NEW HIGH SCORE! ★"
-            new_high_surf = self.font_large.render(new_high_text, True, (255, 215, 0))
+            new_high_surf = self.text.render(new_high_text, 72, (255, 215, 0))
             new_high_rect = new_high_surf.get_rect(center=(SCREEN_WIDTH//2, SCREEN_HEIGHT//2 + 120))
-            
+
             # Pulse effect
             pulse = 1.0 + 0.1 * math.sin(pygame.time.get_ticks() / 200)
             new_high_surf = pygame.transform.scale(new_high_surf, 
@@ -1158,16 +3327,131 @@ class Game:
                                                     int(new_high_surf.get_height() * pulse)))
             new_high_rect = new_high_surf.get_rect(center=(SCREEN_WIDTH//2, SCREEN_HEIGHT//2 + 120))
             self.screen.blit(new_high_surf, new_high_rect)
-        
+
         # Restart instruction
         restart_text = "Press 'R' to Restart"
-        restart_surf = self.font_medium.render(restart_text, True, (200, 200, 200))
+        restart_surf = self.text.render(restart_text, 40, (200, 200, 200))
         restart_rect = restart_surf.get_rect(center=(SCREEN_WIDTH//2, SCREEN_HEIGHT - 100))
-        
+
         # Blink effect
         if (pygame.time.get_ticks() // 500) % 2:
             self.screen.blit(restart_surf, restart_rect)
 
+def build_asset_pack(path=ASSET_PACK_PATH, frames=1800, seed=0):
+    """Draw every surface a session uses, then write them all to one pack.
+
+    A headless swarm session with an invulnerable, shielded player runs
+    with every frame drawn, while each kill, pickup and game-over effect
+    is triggered once so its particle stamps are baked too.
+    """
+    ASSETS.entries.clear()
+    ASSETS.packed.clear()
+    ASSETS.packed_strips.clear()
+    game = Game(headless=True, seed=seed, swarm=60, asset_pack=None)
+    game.player.invulnerability_timer = float("inf")
+    game.player.activate_powerup(PowerUpType.SHIELD)
+    for enemy_type in ENEMY_TYPES:
+        game.on_enemy_killed_with_data(enemy_type, SCREEN_WIDTH // 2, SCREEN_HEIGHT // 2)
+    for powerup_type in PowerUpType:
+        game.powerup_pool.acquire(powerup_type, (game.all_sprites, game.powerups), *game.player.rect.center)
+    # Every size the pulsing health hearts step through
+    for size in range(27, 34):
+        ASSETS.get("heart", size, (255, 50, 50))
+    game.run_headless(frames, draw_every=1, stop_on_game_over=False)
+    game.game_over()
+    game.draw()
+    return ASSETS.save_pack(path)
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Neon Assault")
+    parser.add_argument("--headless", action="store_true",
+                        help="run without a window using a fixed timestep and the autopilot")
+    parser.add_argument("--frames", type=int, default=36000,
+                        help="frames to simulate in headless mode")
+    parser.add_argument("--dt", type=float, default=SIM_DT,
+                        help="fixed timestep for headless mode, in seconds")
+    parser.add_argument("--draw-every", type=int, default=0,
+                        help="render one frame in every N in headless mode (0 = never)")
+    parser.add_argument("--seed", type=int,
+                        help="seed for all random streams (random if omitted)")
+    parser.add_argument("--record", metavar="PATH",
+                        help="record per-frame input and dt to PATH")
+    parser.add_argument("--replay", metavar="PATH",
+                        help="replay a recording frame-for-frame")
+    parser.add_argument("--dirty-rects", action="store_true",
+                        help="only repaint changed screen regions (for slow displays)")
+    parser.add_argument("--stars", type=int, default=80,
+                        help="number of background stars")
+    parser.add_argument("--swarm", type=int, default=0, metavar="N",
+                        help="stress test: keep at least N enemies on the field")
+    parser.add_argument("--waves", metavar="PATH", default=WAVES_PATH,
+                        help="wave definition file (JSON)")
+    parser.add_argument("--collision", choices=[p.value for p in CollisionPrecision], default="pixel",
+                        help="narrow-phase test: pixel masks (exact and fastest), or the circle and "
+                             "polygon approximations, which are slower and miss or invent hits")
+    parser.add_argument("--gc", choices=("monitor", "tuned"),
+                        help="log GC pauses per frame; tuned also freezes session objects and collects in idle time")
+    parser.add_argument("--trace-allocs", type=int, default=0, metavar="N",
+                        help="tracemalloc every Nth frame's profiler phases and print top allocation sites at exit")
+    parser.add_argument("--profile-out", metavar="PATH",
+                        help="export profiler samples at exit (.csv per frame, .json summary)")
+    parser.add_argument("--quality", choices=["auto"] + [tier.name for tier in QUALITY_TIERS],
+                        help="effect quality tier, or auto to trade it for frame time (default: auto, high when headless)")
+    parser.add_argument("--frame-budget", type=float, default=1000 / FPS, metavar="MS",
+                        help="per-frame work time the auto quality governor aims to stay under")
+    parser.add_argument("--pipeline", action="store_true",
+                        help="simulate the next frame on a worker thread while the main thread draws the last one")
+    parser.add_argument("--build-assets", nargs="?", const=ASSET_PACK_PATH, metavar="PATH",
+                        help=f"draw all art into a prebaked pack loaded at startup (default {os.path.basename(ASSET_PACK_PATH)})")
+    return parser.parse_args(argv)
+
 if __name__ == "__main__":
-    game = Game()
-    game.run()
\ No newline at end of file
+    args = parse_args()
+    if args.pipeline and args.dirty_rects:
+        sys.exit("--pipeline always redraws the whole frame; drop --dirty-rects")
+    if args.build_assets:
+        start = time.perf_counter()
+        count = build_asset_pack(args.build_assets)
+        pygame.quit()
+        print(f"Wrote {count} surfaces to {args.build_assets} in {time.perf_counter() - start:.2f} s")
+        sys.exit()
+
+    seed = args.seed
+    if args.replay:
+        policy = InputReplay(args.replay)
+        seed = policy.seed
+    else:
+        if seed is None:
+            seed = random.SystemRandom().randrange(2**63)
+        policy = AutopilotPolicy() if args.headless else KeyboardPolicy()
+        if args.record:
+            policy = InputRecorder(policy, args.record, seed)
+
+    if args.headless:
+        game = Game(headless=True, input_policy=policy, seed=seed, dirty_rects=args.dirty_rects,
+                    star_count=args.stars, swarm=args.swarm,
+                    collision_precision=args.collision, waves=args.waves,
+                    gc_mode=args.gc, trace_allocs=args.trace_allocs,
+                    quality=args.quality or "high", frame_budget_ms=args.frame_budget,
+                    pipeline=args.pipeline, profile_history=bool(args.profile_out))
+        frames = len(policy) if args.replay else args.frames
+        report = game.run_headless(frames, dt=args.dt, draw_every=args.draw_every,
+                                   stop_on_game_over=not args.replay)
+        report["seed"] = seed
+        policy.close()
+        if args.profile_out:
+            game.profiler.export(args.profile_out)
+        pygame.quit()
+        for key, value in report.items():
+            print(f"{key}: {value:.2f}" if isinstance(value, float) else f"{key}: {value}")
+        game.close_monitors()
+    else:
+        game = Game(input_policy=policy, seed=seed, dirty_rects=args.dirty_rects,
+                    star_count=args.stars, swarm=args.swarm,
+                    collision_precision=args.collision, waves=args.waves,
+                    gc_mode=args.gc, trace_allocs=args.trace_allocs,
+                    quality=args.quality or "auto", frame_budget_ms=args.frame_budget,
+                    pipeline=args.pipeline, profile_history=bool(args.profile_out))
+        game.run()
+        if args.profile_out:
+            game.profiler.export(args.profile_out)
@@ -0,0 +1,95 @@
+"""Batch simulator: run many seeded headless games across all CPU cores.
+
+Each worker process owns one headless Game and plays sessions with the
+autopilot, streaming one JSON line of stats per session as it finishes.
+
+    python simulate.py --runs 10000 --frames 36000 --out results.jsonl
+    python simulate.py --runs 2000 --spawn-weights 60,25,12,3 --combo-step 0.25
+"""
+import argparse
+import json
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+import numpy as np
+
+os.environ.setdefault("PYGAME_HIDE_SUPPORT_PROMPT", "1")
+import main
+
+# The worker's Game, created once per process by init_worker
+_game = None
+
+def init_worker(spawn_weights, combo_step):
+    global _game
+    if spawn_weights is not None:
+        main.ENEMY_SPAWN_WEIGHTS = dict(zip(main.ENEMY_SPAWN_WEIGHTS, spawn_weights))
+    if combo_step is not None:
+        main.COMBO_MULTIPLIER_STEP = combo_step
+    _game = main.Game(headless=True)
+
+def run_session(seed, frames, dt):
+    """Play one seeded session to game over (or the frame limit) and report it"""
+    _game.reset_game(seed)
+    # The worker's game is reused, so drop the last session's samples
+    _game.profiler.reset()
+    report = _game.run_headless(frames, dt=dt)
+    report["seed"] = seed
+    report["pid"] = os.getpid()
+    return report
+
+def summarize(reports):
+    keys = ("score", "kills", "wave", "sim_seconds", "peak_sprites", "frame_ms_p99")
+    summary = {"runs": len(reports)}
+    for key in keys:
+        values = np.array([report[key] for report in reports], dtype=float)
+        summary[key] = {
+            "mean": float(values.mean()),
+            "p50": float(np.percentile(values, 50)),
+            "p95": float(np.percentile(values, 95)),
+            "max": float(values.max()),
+        }
+    return summary
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Run seeded headless Neon Assault sessions in parallel")
+    parser.add_argument("--runs", type=int, default=100, help="number of sessions")
+    parser.add_argument("--workers", type=int, default=os.cpu_count(), help="worker processes")
+    parser.add_argument("--frames", type=int, default=36000, help="frame limit per session")
+    parser.add_argument("--dt", type=float, default=main.SIM_DT, help="fixed timestep in seconds")
+    parser.add_argument("--seed", type=int, default=0, help="seed of the first session")
+    parser.add_argument("--out", help="write one JSON line per session here (default: stdout)")
+    parser.add_argument("--spawn-weights", type=lambda s: [float(w) for w in s.split(",")],
+                        help="normal,fast,tank,boss spawn weights")
+    parser.add_argument("--combo-step", type=float, help="combo multiplier gained per chained kill")
+    return parser.parse_args(argv)
+
+def main_cli(argv=None):
+    args = parse_args(argv)
+    if args.spawn_weights is not None and len(args.spawn_weights) != len(main.ENEMY_SPAWN_WEIGHTS):
+        sys.exit(f"--spawn-weights needs {len(main.ENEMY_SPAWN_WEIGHTS)} values")
+
+    out = open(args.out, "w") if args.out else sys.stdout
+    reports = []
+    start = time.perf_counter()
+    try:
+        with ProcessPoolExecutor(max_workers=args.workers, initializer=init_worker,
+                                 initargs=(args.spawn_weights, args.combo_step)) as pool:
+            futures = [pool.submit(run_session, args.seed + i, args.frames, args.dt)
+                       for i in range(args.runs)]
+            for future in as_completed(futures):
+                report = future.result()
+                reports.append(report)
+                out.write(json.dumps(report) + "\n")
+                out.flush()
+    finally:
+        if out is not sys.stdout:
+            out.close()
+
+    summary = summarize(reports) if reports else {"runs": 0}
+    summary["wall_seconds"] = time.perf_counter() - start
+    print(json.dumps(summary, indent=2), file=sys.stderr)
+
+if __name__ == "__main__":
+    main_cli()
@@ -0,0 +1,33 @@
+import os
+import sys
+
+import pytest
+
+os.environ.setdefault("PYGAME_HIDE_SUPPORT_PROMPT", "1")
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), os.pardir))
+import main
+
+SEED = 2
+FRAMES = 3600
+
+def outcome(report):
+    return report["frames"], report["score"], report["kills"], report["wave"]
+
+@pytest.fixture(scope="session")
+def play():
+    """Play the seeded autopilot session; returns (frames, score, kills, wave)"""
+    def play(draw_every=0, input_policy=None, frames=FRAMES, **kwargs):
+        kwargs.setdefault("asset_pack", None)
+        game = main.Game(headless=True, input_policy=input_policy, seed=SEED, **kwargs)
+        return outcome(game.run_headless(frames, draw_every=draw_every))
+    return play
+
+@pytest.fixture(scope="session")
+def recorded(play, tmp_path_factory):
+    """Outcome of the reference session, and the recording of its input"""
+    path = str(tmp_path_factory.mktemp("recordings") / "session.rec")
+    recorder = main.InputRecorder(main.AutopilotPolicy(), path, SEED)
+    result = play(input_policy=recorder)
+    recorder.close()
+    return result, path
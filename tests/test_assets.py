@@ -0,0 +1,82 @@
+import json
+import struct
+
+import pygame
+import pytest
+
+import main
+
+KEYS = [("bullet", (8, 18), main.COLOR_BULLET), ("player", (50, 60), main.COLOR_PLAYER)]
+
+def pixels(asset):
+    return pygame.image.tobytes(asset.image, "RGBA")
+
+@pytest.fixture
+def pack(tmp_path):
+    """A small pack with two sprites and one power-up strip, and the art it holds"""
+    cache = main.AssetCache()
+    art = [pixels(cache.get(*key)) for key in KEYS]
+    cache.powerup_strip(main.PowerUpType.SHIELD)
+    path = tmp_path / "assets.pack"
+    assert cache.save_pack(str(path)) > len(KEYS)
+    assert not (tmp_path / "assets.pack.tmp").exists()
+    return path, art
+
+def reload(path):
+    cache = main.AssetCache()
+    return cache, cache.load_pack(str(path))
+
+def test_pack_round_trip(pack):
+    path, art = pack
+    cache, count = reload(path)
+    assert count > len(KEYS)
+    assert [pixels(cache.get(*key)) for key in KEYS] == art
+    assert cache.pack is not None
+
+def rewrite_index(data, edit):
+    header = len(main.AssetCache.PACK_MAGIC) + 4
+    (length,) = struct.unpack_from("<I", data, len(main.AssetCache.PACK_MAGIC))
+    index = json.loads(data[header:header + length])
+    edit(index)
+    encoded = json.dumps(index).encode()
+    return main.AssetCache.PACK_MAGIC + struct.pack("<I", len(encoded)) + encoded + data[header + length:]
+
+def truncate(data):
+    return data[:len(data) - 100]
+
+def short_header(data):
+    return data[:10]
+
+def garbled_index(data):
+    return data[:12] + b"\xff" * 40 + data[52:]
+
+def stale(data):
+    return rewrite_index(data, lambda index: index.update(hash="0" * 64))
+
+def missing_strips(data):
+    return rewrite_index(data, lambda index: index.pop("strips"))
+
+def out_of_bounds(data):
+    def edit(index):
+        for entry in index["assets"].values():
+            entry[2] += len(data)
+    return rewrite_index(data, edit)
+
+@pytest.mark.parametrize("damage", [truncate, short_header, garbled_index, stale, missing_strips, out_of_bounds])
+def test_damaged_pack_is_ignored_and_art_is_drawn(pack, damage):
+    path, art = pack
+    path.write_bytes(damage(path.read_bytes()))
+    cache, count = reload(path)
+    assert count == 0
+    assert cache.pack is None and not cache.packed
+    assert [pixels(cache.get(*key)) for key in KEYS] == art
+    assert len(cache.powerup_strip(main.PowerUpType.SHIELD)) > 0
+
+def test_session_from_pack_matches(play, recorded, tmp_path, monkeypatch):
+    path = str(tmp_path / "assets.pack")
+    monkeypatch.setattr(main, "ASSETS", main.AssetCache())
+    main.build_asset_pack(path, frames=120)
+    # A fresh cache, as at launch, so the game maps the pack instead of drawing
+    monkeypatch.setattr(main, "ASSETS", main.AssetCache())
+    assert play(draw_every=1, asset_pack=path) == recorded[0]
+    assert main.ASSETS.pack is not None
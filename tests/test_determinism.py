@@ -0,0 +1,35 @@
+"""A seeded headless session must play out the same however it is run:
+replayed from a recording, or drawn every frame or never. Drawing only
+touches the cosmetic random streams."""
+import pytest
+
+import main
+from conftest import FRAMES, SEED
+
+def test_session_gets_somewhere(recorded):
+    frames, score, kills, wave = recorded[0]
+    assert frames == FRAMES
+    assert kills > 0 and wave >= 2
+
+def test_replay_matches_recording(play, recorded):
+    result, path = recorded
+    replay = main.InputReplay(path)
+    assert replay.seed == SEED
+    assert len(replay) == FRAMES
+    assert play(input_policy=replay, frames=len(replay)) == result
+
+@pytest.mark.parametrize("draw_every", [1, 7])
+def test_drawing_does_not_change_outcome(play, recorded, draw_every):
+    assert play(draw_every=draw_every) == recorded[0]
+
+def test_input_state_bits_round_trip():
+    for bits in range(1 << len(main.InputState.FIELDS)):
+        assert main.InputState.from_bits(bits).to_bits() == bits
+    assert main.InputState().to_bits() == 0
+    assert main.InputState(fire=True).to_bits() == 1 << main.InputState.FIELDS.index("fire")
+    assert main.InputState.from_bits(0b00101) == main.InputState(left=True, up=True)
+
+def test_input_state_bits_leave_room_for_restart():
+    every = main.InputState(*(True for _ in main.InputState.FIELDS)).to_bits()
+    assert every & main.RESTART_BIT == 0
+    assert main.InputState.from_bits(every | main.RESTART_BIT).to_bits() == every
@@ -0,0 +1,55 @@
+import threading
+
+import main
+
+def test_pipelined_does_not_change_outcome(play, recorded):
+    assert play(draw_every=1, pipeline=True) == recorded[0]
+
+def test_submit_times_its_wait_for_the_main_thread():
+    frames = main.FrameBuffer()
+    frames.submit(main.DrawList())
+    # The main thread takes the first frame 50 ms later, freeing the back buffer
+    threading.Timer(0.05, frames.take).start()
+    frames.submit(main.DrawList())
+    assert frames.wait_ms >= 40
+
+def test_governor_ignores_waiting_on_the_paced_main_thread():
+    game = main.Game(input_policy=main.AutopilotPolicy(), seed=1, pipeline=True, quality="auto",
+                     asset_pack=None)
+    game.player.invulnerability_timer = float("inf")
+    recorded = []
+    record = game.quality.record
+    game.quality.record = lambda ms: recorded.append(ms) or record(ms)
+    tick = game.tick
+    def tick_until(dt):
+        # Enough 60 Hz frames for the governor to act at least once
+        if len(recorded) >= 200:
+            game.running = False
+        return tick(dt)
+    game.tick = tick_until
+    game.run_pipelined(game.play_window, pace=True)
+    recorded.sort()
+    # A light scene works far below the 16.7 ms budget even though every
+    # frame waits for the main thread's 60 Hz flip
+    assert recorded[len(recorded) // 2] < 1000 / main.FPS * 0.6
+    assert game.quality.tier.name == "high"
+
+def test_keyboard_is_read_on_the_main_thread(monkeypatch):
+    readers = set()
+    get_pressed = main.pygame.key.get_pressed
+    def spy():
+        readers.add(threading.current_thread())
+        return get_pressed()
+    monkeypatch.setattr(main.pygame.key, "get_pressed", spy)
+    game = main.Game(seed=1, pipeline=True, asset_pack=None)
+    assert isinstance(game.input_policy, main.KeyboardPolicy)
+    tick = game.tick
+    steps = []
+    def tick_until(dt):
+        steps.append(dt)
+        if len(steps) >= 60:
+            game.running = False
+        return tick(dt)
+    game.tick = tick_until
+    game.run_pipelined(game.play_window, pace=True)
+    assert readers == {threading.main_thread()}
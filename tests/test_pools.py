@@ -0,0 +1,14 @@
+import main
+
+def test_restart_returns_falling_powerups_to_the_pool():
+    game = main.Game(headless=True, seed=1, asset_pack=None)
+    falling = [game.powerup_pool.acquire(powerup_type, (game.all_sprites, game.powerups), 100, 100)
+               for powerup_type in main.PowerUpType]
+    game.reset_game()
+    assert not any(powerup.alive() for powerup in falling)
+    for powerup in falling:
+        assert powerup in game.powerup_pool.free[powerup.powerup_type]
+    # Spawning again reuses them rather than building new sprites
+    for powerup_type in main.PowerUpType:
+        game.powerup_pool.acquire(powerup_type, (game.all_sprites, game.powerups), 100, 100)
+    assert game.powerup_pool.misses == 0
@@ -0,0 +1,33 @@
+import main
+
+def governor(**kwargs):
+    return main.QualityGovernor(budget_ms=10.0, window=3, hold=5, **kwargs)
+
+def test_governor_fixed_tier_never_moves():
+    quality = governor(tier=2, adaptive=False)
+    assert not any(quality.record(100.0) for _ in range(50))
+    assert quality.tier.name == "low"
+
+def test_governor_drops_after_hold_then_waits():
+    quality = governor()
+    changes = [quality.record(12.0) for _ in range(15)]
+    # Above upper * budget: one step per hold period, never sooner
+    assert changes == [False] * 4 + [True] + [False] * 4 + [True] + [False] * 4 + [True]
+    assert quality.level == 3
+    assert not any(quality.record(12.0) for _ in range(20))
+    assert quality.tier.name == "minimal"
+
+def test_governor_holds_between_thresholds():
+    quality = governor(tier=1)
+    # Between lower (6 ms) and upper (9 ms) the tier stays put
+    assert not any(quality.record(ms) for ms in [6.5, 8.5, 7.0] * 20)
+    assert quality.level == 1
+
+def test_governor_rises_when_fast():
+    quality = governor(tier=2)
+    changes = [quality.record(3.0) for _ in range(20)]
+    assert changes.count(True) == 2
+    assert quality.level == 0
+
+def test_minimal_quality_does_not_change_outcome(play, recorded):
+    assert play(draw_every=1, quality="minimal") == recorded[0]
@@ -0,0 +1,77 @@
+import json
+import math
+
+import pytest
+
+import main
+
+# Fixed enemy types so compiling never touches the spawn stream
+WAVES = [
+    {"name": "One", "duration": 10, "groups": [
+        {"type": "normal", "count": 3, "every": 2.0},
+        {"type": "fast", "count": 2, "at": 1.0, "every": 0.5, "speed": 20}]},
+    {"name": "Two", "duration": 20, "groups": [{"type": "tank", "count": 4, "every": 1.0, "speed": 10}]},
+]
+LOOP = {"speed": 40, "every_scale": 0.5, "min_every": 0.3}
+
+def test_compile_first_wave():
+    director = main.WaveDirector(WAVES, LOOP)
+    number, start, end, events = director.compile(1, 100.0)
+    assert (number, start, end) == (1, 100.0, 110.0)
+    assert [(t, enemy_type, speed) for t, _, enemy_type, speed in events] == [
+        (100.0, "normal", 0), (101.0, "fast", 20), (101.5, "fast", 20),
+        (102.0, "normal", 0), (104.0, "normal", 0)]
+    sequence = [seq for _, seq, _, _ in events]
+    assert len(set(sequence)) == len(sequence)
+
+def test_compile_loops_last_wave_faster():
+    director = main.WaveDirector(WAVES, LOOP)
+    # Wave 4 is the second pass over the last wave: every 1.0 * 0.5 ** 2, capped at min_every
+    number, start, end, events = director.compile(4, 50.0)
+    assert (number, start, end) == (4, 50.0, 70.0)
+    assert len(events) == math.ceil(4 * 1.0 / 0.3)
+    assert [t for t, _, _, _ in events] == pytest.approx([50.0 + k * 0.3 for k in range(len(events))])
+    assert {speed for _, _, _, speed in events} == {10 + 2 * 40}
+
+def test_advance_spawns_in_order():
+    director = main.WaveDirector(WAVES, LOOP)
+    assert director.advance(0.0) == [("normal", 0)]
+    assert director.advance(1.5) == [("fast", 20), ("fast", 20)]
+    assert director.advance(9.0) == [("normal", 0), ("normal", 0), ("tank", 10)]
+    assert (director.wave, director.wave_name) == (2, "Two")
+
+def write(path, text):
+    path.write_text(text)
+    return str(path)
+
+@pytest.mark.parametrize("text", [
+    "{not json",
+    '{"waves": []}',
+    '{"waves": [{"groups": []}]}',
+    '{"waves": [{"duration": 0, "groups": []}]}',
+    '{"waves": [{"duration": NaN, "groups": []}]}',
+    '{"waves": [{"name": 5, "duration": 10, "groups": []}]}',
+    '{"waves": [{"duration": 10, "groups": [{"type": "normal", "count": -1}]}]}',
+    '{"waves": [{"duration": 10, "groups": [{"type": "normal", "every": Infinity}]}]}',
+    '{"waves": [{"duration": 10, "groups": [{"type": "dragon"}]}]}',
+    '{"waves": [{"duration": 10, "groups": []}], "loop": {"speed": 0, "every_scale": 0, "min_every": 1}}',
+])
+def test_bad_wave_files_fall_back(tmp_path, text):
+    director = main.WaveDirector.load(write(tmp_path / "waves.json", text))
+    assert director.waves == main.WaveDirector.FALLBACK["waves"]
+
+def test_negative_speeds_never_empty_the_spawn_range(tmp_path, capsys):
+    waves = {
+        "waves": [{"name": "Crawl", "duration": 2, "groups": [
+            {"type": "boss", "count": 4, "every": 0.5, "speed": -200},
+            {"type": "normal", "count": 4, "every": 0.5}]}],
+        "loop": {"speed": -300, "every_scale": 0.9, "min_every": 0.25},
+    }
+    path = write(tmp_path / "waves.json", json.dumps(waves))
+    game = main.Game(headless=True, seed=1, waves=path, asset_pack=None)
+    game.player.invulnerability_timer = float("inf")
+    report = game.run_headless(1200)
+    assert "Error" not in capsys.readouterr().out
+    assert report["wave"] > 2
+    slowest = min(stats.speed[0] for stats in main.ENEMY_STATS.values())
+    assert game.enemies.speed_y[game.enemies.active()].min() >= slowest